@@ -1,5 +1,7 @@
-from pydantic_settings import BaseSettings
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing import Optional
+from functools import lru_cache
 import os
 
 
@@ -33,6 +35,8 @@ class Settings(BaseSettings):
     DOWNLOAD_CONCURRENT_COUNT: int = 5
     DOWNLOAD_CHUNK_SIZE: int = 8192
     DOWNLOAD_TIMEOUT: int = 300
+    DOWNLOAD_PARALLEL_MIN_SIZE: int = 16 * 1024 * 1024
+    DOWNLOAD_PARALLEL_SEGMENTS: int = 4
 
     # 同步配置
     SYNC_INTERVAL_SECONDS: int = 10
@@ -47,7 +51,9 @@ class Settings(BaseSettings):
     AUTO_SAVE_WINDOW_STATE: bool = True
 
     # 日志配置
-    LOG_DIR: str = os.path.join(os.path.expanduser("~"), ".jy_draft", "logs")
+    LOG_DIR: str = Field(
+        default_factory=lambda: os.path.join(os.path.expanduser("~"), ".jy_draft", "logs")
+    )  # 仅在未通过环境变量配置时计算
     LOG_LEVEL: str = "INFO"
     LOG_FORMAT: str = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
     LOG_DATE_FORMAT: str = "%Y-%m-%d %H:%M:%S"
@@ -61,14 +67,31 @@ class Settings(BaseSettings):
     ERROR_LOG_MAX_SIZE: str = "10MB"
     ERROR_LOG_BACKUP_COUNT: int = 5
 
-    class Config:
-        """配置类设置
+    # 配置类设置
+    # case_sensitive: 区分大小写
+    # env_file: 环境变量文件路径
+    # extra: 忽略 .env 中未定义的配置项
+    model_config = SettingsConfigDict(
+        case_sensitive=True,
+        env_file=".env",
+        extra="ignore",
+    )
 
-        case_sensitive: 区分大小写
-        env_file: 环境变量文件路径
-        """
-        case_sensitive = True
-        env_file = ".env"
 
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """获取全局配置实例
 
-settings = Settings()  # 创建全局配置实例
\ No newline at end of file
+    首次调用时才读取环境变量和 .env 文件，之后返回同一个实例。
+
+    Returns:
+        Settings: 配置实例
+    """
+    return Settings()
+
+
+def __getattr__(name: str):
+    """兼容旧的 ``from app.config import settings`` 用法"""
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
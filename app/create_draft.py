@@ -1,13 +1,34 @@
 from PyQt6.QtCore import Qt
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-                           QLineEdit, QPushButton, QFrame, QFileDialog,
-                           QMessageBox)
+                           QLineEdit, QPushButton, QFrame, QMessageBox)
 from PyQt6.QtGui import QFont
+from functools import lru_cache
 import os
+import re
+
+# 用户主目录，作为选择保存路径时的初始目录
+_HOME = os.path.expanduser("~")
+
+# UUID只允许字母、数字、下划线和连字符，同时避免拼出越级路径
+_UUID_RE = re.compile(r"^[\w\-]{1,64}$")
+
+
+@lru_cache(maxsize=None)
+def _font(family, size):
+    """获取共享的字体对象
+
+    QFont 必须在 QApplication 创建之后构造，因此按需创建并缓存，
+    同一字体只解析一次。
+    """
+    return QFont(family, size)
+
 
 class CreateDraftPage(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
+        self.setObjectName("createDraftPage")
+        self._msgbox = None  # 复用的消息框，首次使用时创建
+        self._dir_dlg = None  # 复用的目录选择对话框，首次使用时创建
         self.setup_ui()
         self.setup_connections()
 
@@ -29,7 +50,7 @@ class CreateDraftPage(QWidget):
         # 标题
         title = QLabel("创建草稿箱")
         title.setObjectName("pageTitle")
-        title.setFont(QFont("SF Pro Display", 24))
+        title.setFont(_font("SF Pro Display", 24))
         title.setAlignment(Qt.AlignmentFlag.AlignCenter)
         form_layout.addWidget(title)
 
@@ -39,7 +60,7 @@ class CreateDraftPage(QWidget):
         
         uuid_label = QLabel("UUID:")
         uuid_label.setObjectName("fieldLabel")
-        uuid_label.setFont(QFont("SF Pro Text", 13))
+        uuid_label.setFont(_font("SF Pro Text", 13))
         
         self.uuid_input = QLineEdit()
         self.uuid_input.setObjectName("uuidInput")
@@ -56,7 +77,7 @@ class CreateDraftPage(QWidget):
         
         folder_label = QLabel("保存路径:")
         folder_label.setObjectName("fieldLabel")
-        folder_label.setFont(QFont("SF Pro Text", 13))
+        folder_label.setFont(_font("SF Pro Text", 13))
         
         folder_input_layout = QHBoxLayout()
         folder_input_layout.setSpacing(10)
@@ -70,7 +91,7 @@ class CreateDraftPage(QWidget):
         self.browse_btn = QPushButton("浏览...")
         self.browse_btn.setObjectName("browseButton")
         self.browse_btn.setMinimumHeight(32)
-        self.browse_btn.setFont(QFont("SF Pro Text", 13))
+        self.browse_btn.setFont(_font("SF Pro Text", 13))
         
         folder_input_layout.addWidget(self.folder_input)
         folder_input_layout.addWidget(self.browse_btn)
@@ -87,92 +108,30 @@ class CreateDraftPage(QWidget):
         self.generate_btn.setObjectName("generateButton")
         self.generate_btn.setMinimumWidth(200)
         self.generate_btn.setMinimumHeight(38)
-        self.generate_btn.setFont(QFont("SF Pro Text", 14))
+        self.generate_btn.setFont(_font("SF Pro Text", 14))
         form_layout.addWidget(self.generate_btn, alignment=Qt.AlignmentFlag.AlignCenter)
 
         # 将表单卡片添加到主布局
         layout.addWidget(form_card)
 
-        # 设置样式
-        self.setStyleSheet("""
-            QWidget {
-                background-color: white;
-            }
-            
-            #formCard {
-                background-color: white;
-                border-radius: 10px;
-            }
-            
-            #pageTitle {
-                color: #1d1d1f;
-                margin-bottom: 20px;
-            }
-            
-            #fieldLabel {
-                color: #1d1d1f;
-                font-weight: 500;
-            }
-            
-            QLineEdit {
-                background-color: #f5f5f7;
-                border: none;
-                border-radius: 6px;
-                padding: 0 10px;
-                font-size: 14px;
-                color: #1d1d1f;
-            }
-            
-            QLineEdit:focus {
-                background-color: white;
-                border: 2px solid #0066cc;
-            }
-            
-            QLineEdit:disabled {
-                background-color: #f5f5f7;
-                color: #86868b;
-            }
-            
-            QPushButton#browseButton {
-                background-color: #f5f5f7;
-                border: none;
-                border-radius: 6px;
-                color: #1d1d1f;
-                padding: 0 15px;
-            }
-            
-            QPushButton#browseButton:hover {
-                background-color: #e5e5e5;
-            }
-            
-            QPushButton#generateButton {
-                background-color: #0066cc;
-                border: none;
-                border-radius: 6px;
-                color: white;
-                padding: 0 20px;
-            }
-            
-            QPushButton#generateButton:hover {
-                background-color: #0055b3;
-            }
-            
-            QPushButton#generateButton:pressed {
-                background-color: #004c99;
-            }
-        """)
-
     def setup_connections(self):
         self.browse_btn.clicked.connect(self.browse_folder)
         self.generate_btn.clicked.connect(self.generate_draft)
 
     def browse_folder(self):
-        folder = QFileDialog.getExistingDirectory(
-            self,
-            "选择保存路径",
-            os.path.expanduser("~"),
-            QFileDialog.Option.ShowDirsOnly
-        )
+        if self._dir_dlg is None:
+            # 文件对话框只在点击浏览时才需要
+            from PyQt6.QtWidgets import QFileDialog
+
+            self._dir_dlg = QFileDialog(self, "选择保存路径", _HOME)
+            self._dir_dlg.setFileMode(QFileDialog.FileMode.Directory)
+            self._dir_dlg.setOption(QFileDialog.Option.ShowDirsOnly, True)
+            self._dir_dlg.fileSelected.connect(self.on_folder_selected)
+
+        # 非阻塞打开，选择结果通过 fileSelected 信号返回
+        self._dir_dlg.open()
+
+    def on_folder_selected(self, folder):
         if folder:
             self.folder_input.setText(folder)
 
@@ -186,6 +145,10 @@ class CreateDraftPage(QWidget):
             self.show_message("错误", "请输入UUID", QMessageBox.Icon.Warning)
             return
         
+        if not _UUID_RE.match(uuid):
+            self.show_message("错误", "UUID格式不正确", QMessageBox.Icon.Warning)
+            return
+        
         if not folder:
             self.show_message("错误", "请选择保存路径", QMessageBox.Icon.Warning)
             return
@@ -193,8 +156,12 @@ class CreateDraftPage(QWidget):
         try:
             # TODO: 这里添加实际的草稿箱生成逻辑
             # 示例：创建文件夹
-            draft_path = os.path.join(folder, f"draft_{uuid}")
-            os.makedirs(draft_path, exist_ok=True)
+            draft_path = os.path.join(folder, "draft_" + uuid)
+            if not os.path.isdir(draft_path):
+                try:
+                    os.makedirs(draft_path)
+                except FileExistsError:
+                    pass
             
             # 成功提示
             self.show_message("成功", "草稿箱创建成功！", QMessageBox.Icon.Information)
@@ -208,36 +175,15 @@ class CreateDraftPage(QWidget):
             self.show_message("错误", f"创建草稿箱失败：{str(e)}", QMessageBox.Icon.Critical)
 
     def show_message(self, title, message, icon=QMessageBox.Icon.Information):
-        msg = QMessageBox(self)
+        if self._msgbox is None:
+            self._msgbox = QMessageBox(self)
+            self._msgbox.setObjectName("createDraftMessage")
+            self._msgbox.setStandardButtons(QMessageBox.StandardButton.Ok)
+
+        msg = self._msgbox
         msg.setWindowTitle(title)
         msg.setText(message)
         msg.setIcon(icon)
-        msg.setStandardButtons(QMessageBox.StandardButton.Ok)
-        
-        # 设置消息框样式
-        msg.setStyleSheet("""
-            QMessageBox {
-                background-color: white;
-            }
-            QLabel {
-                color: #1d1d1f;
-                font-size: 14px;
-                font-family: 'SF Pro Text';
-            }
-            QPushButton {
-                background-color: #0066cc;
-                color: white;
-                border: none;
-                border-radius: 6px;
-                padding: 8px 16px;
-                font-family: 'SF Pro Text';
-                font-size: 13px;
-                min-width: 80px;
-            }
-            QPushButton:hover {
-                background-color: #0055b3;
-            }
-        """)
         
         # 显示在窗口中央
-        msg.exec() 
\ No newline at end of file
+        msg.exec()
@@ -1,9 +1,117 @@
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import (Qt, QAbstractTableModel, QModelIndex, QEvent,
+                          QRect, QRectF, QSize, pyqtSignal)
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-                           QLineEdit, QTableWidget, QTableWidgetItem, 
+                           QLineEdit, QTableView, QStyledItemDelegate,
                            QPushButton, QFrame, QDateTimeEdit, QHeaderView)
-from PyQt6.QtGui import QFont
-from datetime import datetime
+from PyQt6.QtGui import QColor, QPainter
+
+
+class DraftTableModel(QAbstractTableModel):
+    """草稿列表数据模型
+
+    每一行以元组形式保存，操作列本身不存数据，由 OperationDelegate 负责绘制。
+    """
+
+    HEADERS = ("序号", "UUID", "小说名称", "版本名称", "创建人", "创建时间", "操作")
+    OPERATION_COLUMN = 6
+
+    def __init__(self, rows=None, parent=None):
+        super().__init__(parent)
+        self._rows = [tuple(row) for row in rows] if rows else []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+
+        column = index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == self.OPERATION_COLUMN:
+                return None
+            return self._rows[index.row()][column]
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return Qt.AlignmentFlag.AlignCenter
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def set_rows(self, rows):
+        """替换全部数据，只触发一次模型重置"""
+        self.beginResetModel()
+        self._rows = [tuple(row) for row in rows]
+        self.endResetModel()
+
+    def row_data(self, row):
+        """获取指定行的数据"""
+        return self._rows[row]
+
+
+class OperationDelegate(QStyledItemDelegate):
+    """操作列委托
+
+    直接绘制编辑/删除按钮并处理点击，不再为每一行创建按钮控件。
+    """
+
+    edit_clicked = pyqtSignal(int)
+    delete_clicked = pyqtSignal(int)
+
+    BUTTONS = (("编辑", QColor("#2196F3")), ("删除", QColor("#F44336")))
+    BUTTON_MARGIN = 5
+    BUTTON_SPACING = 6
+    BUTTON_PADDING = 16
+
+    def _button_rects(self, rect):
+        """计算每个按钮在单元格中的位置"""
+        count = len(self.BUTTONS)
+        inner = rect.adjusted(self.BUTTON_MARGIN, 4, -self.BUTTON_MARGIN, -4)
+        width = (inner.width() - self.BUTTON_SPACING * (count - 1)) // count
+        return [
+            QRect(inner.left() + i * (width + self.BUTTON_SPACING), inner.top(), width, inner.height())
+            for i in range(count)
+        ]
+
+    def paint(self, painter, option, index):
+        # 先绘制背景（交替行色、选中状态）
+        super().paint(painter, option, index)
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        for (text, color), rect in zip(self.BUTTONS, self._button_rects(option.rect)):
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(color)
+            painter.drawRoundedRect(QRectF(rect), 4, 4)
+            painter.setPen(Qt.GlobalColor.white)
+            painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, text)
+        painter.restore()
+
+    def sizeHint(self, option, index):
+        metrics = option.fontMetrics
+        width = sum(metrics.horizontalAdvance(text) + self.BUTTON_PADDING for text, _ in self.BUTTONS)
+        width += self.BUTTON_SPACING * (len(self.BUTTONS) - 1) + self.BUTTON_MARGIN * 2
+        height = max(super().sizeHint(option, index).height(), metrics.height() + 14)
+        return QSize(width, height)
+
+    def editorEvent(self, event, model, option, index):
+        if (event.type() == QEvent.Type.MouseButtonRelease
+                and event.button() == Qt.MouseButton.LeftButton):
+            pos = event.position().toPoint()
+            edit_rect, delete_rect = self._button_rects(option.rect)
+            if edit_rect.contains(pos):
+                self.edit_clicked.emit(index.row())
+                return True
+            if delete_rect.contains(pos):
+                self.delete_clicked.emit(index.row())
+                return True
+        return super().editorEvent(event, model, option, index)
+
 
 class SearchFrame(QFrame):
     def __init__(self, parent=None):
@@ -78,38 +186,11 @@ class SearchFrame(QFrame):
         
         layout.addLayout(row3_layout)
 
-        # 设置样式
-        self.setStyleSheet("""
-            QFrame#searchFrame {
-                background-color: white;
-                border: 1px solid #e0e0e0;
-                border-radius: 4px;
-            }
-            QLabel {
-                min-width: 60px;
-            }
-            QLineEdit {
-                padding: 5px;
-                border: 1px solid #e0e0e0;
-                border-radius: 4px;
-                margin-right: 10px;
-            }
-            QPushButton {
-                padding: 5px 15px;
-                border-radius: 4px;
-                color: white;
-            }
-            QPushButton#searchButton {
-                background-color: #1976D2;
-            }
-            QPushButton#resetButton {
-                background-color: #757575;
-            }
-        """)
 
 class DraftBoxPage(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
+        self.setObjectName("draftBoxPage")
         self.setup_ui()
 
     def setup_ui(self):
@@ -123,44 +204,29 @@ class DraftBoxPage(QWidget):
         layout.addWidget(self.search_frame, stretch=2)
 
         # 添加表格区域
-        self.table = QTableWidget()
+        self.table = QTableView()
         self.table.setObjectName("draftTable")
         
-        # 设置列
-        headers = ["序号", "UUID", "小说名称", "版本名称", "创建人", "创建时间", "操作"]
-        self.table.setColumnCount(len(headers))
-        self.table.setHorizontalHeaderLabels(headers)
+        # 设置数据模型和操作列委托
+        self.model = DraftTableModel(parent=self)
+        self.table.setModel(self.model)
+        self.operation_delegate = OperationDelegate(self.table)
+        self.table.setItemDelegateForColumn(DraftTableModel.OPERATION_COLUMN, self.operation_delegate)
         
         # 设置表格属性
         self.table.setAlternatingRowColors(True)
-        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
-        self.table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch)
-        self.table.horizontalHeader().setSectionResizeMode(3, QHeaderView.ResizeMode.Stretch)
         
         # 添加一些示例数据
         self.add_sample_data()
         
+        # 数据填充完成后再设置列宽模式，只计算一次内容宽度
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        header.setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch)
+        header.setSectionResizeMode(3, QHeaderView.ResizeMode.Stretch)
+        
         layout.addWidget(self.table, stretch=8)
 
-        # 设置样式
-        self.setStyleSheet("""
-            QTableWidget {
-                background-color: white;
-                border: 1px solid #e0e0e0;
-                border-radius: 4px;
-            }
-            QTableWidget::item {
-                padding: 5px;
-            }
-            QHeaderView::section {
-                background-color: #f5f5f5;
-                padding: 5px;
-                border: none;
-                border-right: 1px solid #e0e0e0;
-                border-bottom: 1px solid #e0e0e0;
-            }
-        """)
-
     def add_sample_data(self):
         # 添加一些示例数据
         sample_data = [
@@ -169,40 +235,4 @@ class DraftBoxPage(QWidget):
             ["3", "uuid-003", "小说3", "v1.5", "用户C", "2024-01-22 12:00:00"],
         ]
 
-        self.table.setRowCount(len(sample_data))
-        for row, data in enumerate(sample_data):
-            for col, text in enumerate(data):
-                item = QTableWidgetItem(text)
-                item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.table.setItem(row, col, item)
-            
-            # 添加操作按钮
-            operations_widget = QWidget()
-            operations_layout = QHBoxLayout(operations_widget)
-            operations_layout.setContentsMargins(5, 0, 5, 0)
-            
-            edit_btn = QPushButton("编辑")
-            edit_btn.setObjectName("editButton")
-            delete_btn = QPushButton("删除")
-            delete_btn.setObjectName("deleteButton")
-            
-            operations_layout.addWidget(edit_btn)
-            operations_layout.addWidget(delete_btn)
-            
-            self.table.setCellWidget(row, 6, operations_widget)
-
-        # 设置操作列按钮样式
-        self.setStyleSheet(self.styleSheet() + """
-            QPushButton#editButton {
-                background-color: #2196F3;
-                color: white;
-                border-radius: 4px;
-                padding: 3px 8px;
-            }
-            QPushButton#deleteButton {
-                background-color: #F44336;
-                color: white;
-                border-radius: 4px;
-                padding: 3px 8px;
-            }
-        """) 
\ No newline at end of file
+        self.model.set_rows(sample_data)
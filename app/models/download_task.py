@@ -1,15 +1,191 @@
-from typing import Optional, Dict, Any, List, Tuple
+from typing import Optional, Dict, Any, List, Tuple, Iterator
+from functools import lru_cache
+from types import MappingProxyType
+from operator import attrgetter
+from collections import deque
+from contextlib import contextmanager
 from datetime import datetime
 import os
 import time
-import math
 
-from ..utils.database import db
+from ..utils.database import db, QueryCache, MAX_VARIABLES
+
+
+# 文件大小单位及对应的字节数
+_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+_SIZE_THRESHOLDS = tuple(1 << (10 * i) for i in range(len(_SIZE_UNITS)))
+
+
+# 常用SQL语句，模块级常量避免每次调用重新构建字符串，便于命中连接的语句缓存
+_SQL_INSERT_TASK = """
+    INSERT INTO download_tasks (
+        user_id, task_name, file_url, file_path, file_size,
+        downloaded_size, status, error_message, created_at, updated_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?,
+        strftime('%Y-%m-%d %H:%M:%S', 'now', 'localtime'),
+        strftime('%Y-%m-%d %H:%M:%S', 'now', 'localtime')
+    )
+"""
+
+_SQL_UPDATE_PROGRESS = """
+    UPDATE download_tasks SET
+        downloaded_size = ?,
+        file_size = ?,
+        updated_at = strftime('%Y-%m-%d %H:%M:%S', 'now', 'localtime')
+    WHERE id = ?
+"""
+
+# save() 可更新的字段；id 和时间戳不由调用方修改
+_UPDATABLE_FIELDS = (
+    'user_id', 'task_name', 'file_url', 'file_path', 'file_size',
+    'downloaded_size', 'status', 'error_message', 'completed_at'
+)
+
+
+@lru_cache(maxsize=128)
+def _build_update_sql(columns: Tuple[str, ...]) -> str:
+    """生成只更新指定字段的UPDATE语句
+    
+    completed_at 使用 CASE 表达式：状态为已完成且未设置完成时间时由SQLite填入当前时间。
+    
+    Args:
+        columns: 需要更新的字段，按 _UPDATABLE_FIELDS 顺序排列
+        
+    Returns:
+        str: UPDATE语句
+    """
+    assignments = [
+        f"{column} = ?" for column in columns if column != 'completed_at'
+    ]
+    if 'completed_at' in columns:
+        assignments.append(
+            "completed_at = CASE "
+            "WHEN ? = 'completed' THEN COALESCE(?, strftime('%Y-%m-%d %H:%M:%S', 'now', 'localtime')) "
+            "ELSE ? END"
+        )
+    assignments.append("updated_at = strftime('%Y-%m-%d %H:%M:%S', 'now', 'localtime')")
+    return f"UPDATE download_tasks SET {', '.join(assignments)} WHERE id = ?"
+
+
+@lru_cache(maxsize=16)
+def _build_bulk_progress_sql(count: int) -> str:
+    """生成一次更新多个任务进度的UPDATE语句
+    
+    各任务的进度放在 VALUES 组成的临时表中，整批只编译和执行一条语句。
+    
+    Args:
+        count: 任务数量
+        
+    Returns:
+        str: UPDATE语句，参数依次为每个任务的 (任务ID, 已下载大小, 文件总大小)
+    """
+    values = ", ".join(["(?, ?, ?)"] * count)
+    return f"""
+        WITH progress(task_id, done_size, total_size) AS (VALUES {values})
+        UPDATE download_tasks SET
+            downloaded_size = (SELECT done_size FROM progress WHERE task_id = download_tasks.id),
+            file_size = (SELECT total_size FROM progress WHERE task_id = download_tasks.id),
+            updated_at = strftime('%Y-%m-%d %H:%M:%S', 'now', 'localtime')
+        WHERE id IN (SELECT task_id FROM progress)
+    """
+
+
+# 下载完成时一次性写入最终进度和完成状态
+_SQL_COMPLETE_PROGRESS = """
+    UPDATE download_tasks SET
+        downloaded_size = ?,
+        file_size = ?,
+        status = 'completed',
+        completed_at = COALESCE(completed_at, ?),
+        updated_at = strftime('%Y-%m-%d %H:%M:%S', 'now', 'localtime')
+    WHERE id = ?
+"""
+
+# 列表查询的字段列表，保证返回行与 DownloadTask.FIELDS 顺序一致
+_SELECT_COLUMNS = (
+    "id, user_id, task_name, file_url, file_path, file_size, downloaded_size, "
+    "status, error_message, created_at, updated_at, completed_at"
+)
+
+_SQL_SELECT_ALL = f"""
+    SELECT {_SELECT_COLUMNS} FROM download_tasks 
+    ORDER BY id DESC LIMIT ? OFFSET ?
+"""
+
+_SQL_SELECT_BY_USER = f"""
+    SELECT {_SELECT_COLUMNS} FROM download_tasks 
+    WHERE user_id = ? 
+    ORDER BY id DESC LIMIT ? OFFSET ?
+"""
+
+_SQL_ITER_BY_USER = f"""
+    SELECT {_SELECT_COLUMNS} FROM download_tasks 
+    WHERE user_id = ? 
+    ORDER BY id DESC
+"""
+
+_SQL_SELECT_BY_STATUS = f"""
+    SELECT {_SELECT_COLUMNS} FROM download_tasks 
+    WHERE status = ? 
+    ORDER BY id DESC
+"""
+
+_SQL_SELECT_BY_STATUS_USER = f"""
+    SELECT {_SELECT_COLUMNS} FROM download_tasks 
+    WHERE status = ? AND user_id = ? 
+    ORDER BY id DESC
+"""
+
+# 活动任务按状态通过 idx_dt_status_user 查找，活动任务很少，排序开销可以忽略
+_SQL_SELECT_ACTIVE = f"""
+    SELECT {_SELECT_COLUMNS} FROM download_tasks 
+    WHERE status IN ('downloading', 'paused') 
+    ORDER BY updated_at DESC
+"""
+
+# get_by_id / get_by_url 的短时查询缓存，任务有写操作时整体失效
+_lookup_cache = QueryCache(ttl=1.0)
+
+
+class _DownloadTaskPool:
+    """可复用的只读任务对象池，供列表渲染等短生命周期场景使用"""
+    
+    __slots__ = ('_free', '_cls')
+    
+    def __init__(self, cls, max_size: int = 256):
+        self._cls = cls
+        self._free = deque(maxlen=max_size)
+    
+    def acquire(self, row) -> 'DownloadTask':
+        """取出一个对象并用数据行填充"""
+        obj = self._free.pop() if self._free else self._cls.__new__(self._cls)
+        obj._set_row(row)
+        return obj
+    
+    def release(self, obj: 'DownloadTask') -> None:
+        """清空对象字段并放回池中"""
+        for field in obj.FIELDS:
+            setattr(obj, field, None)
+        self._free.append(obj)
 
 
 class DownloadTask:
     """下载任务模型类"""
     
+    # 数据库字段
+    FIELDS = (
+        'id', 'user_id', 'task_name', 'file_url', 'file_path', 'file_size',
+        'downloaded_size', 'status', 'error_message', 'created_at',
+        'updated_at', 'completed_at'
+    )
+    
+    __slots__ = FIELDS + ('_last_flush_ts', '_last_flush_bytes', '_clean')
+    
+    _get_fields = attrgetter(*FIELDS)
+    
+    # 字段名 -> 在 FIELDS 中的位置
+    _FIELD_INDEX = MappingProxyType({name: index for index, name in enumerate(FIELDS)})
+    
     # 任务状态常量
     STATUS_PENDING = 'pending'     # 等待下载
     STATUS_DOWNLOADING = 'downloading'  # 下载中
@@ -18,6 +194,28 @@ class DownloadTask:
     STATUS_PAUSED = 'paused'        # 暂停下载
     STATUS_CANCELED = 'canceled'    # 取消下载
     
+    # 状态分组，用于 is_active / can_resume / can_restart 判断
+    _ACTIVE_STATES = frozenset({STATUS_DOWNLOADING, STATUS_PENDING})
+    _RESUMABLE_STATES = frozenset({STATUS_PAUSED, STATUS_FAILED})
+    _RESTARTABLE_STATES = frozenset({STATUS_COMPLETED, STATUS_FAILED, STATUS_CANCELED})
+    
+    # 状态描述
+    STATUS_TEXT_MAP = MappingProxyType({
+        STATUS_PENDING: "等待下载",
+        STATUS_DOWNLOADING: "下载中",
+        STATUS_COMPLETED: "已完成",
+        STATUS_FAILED: "下载失败",
+        STATUS_PAUSED: "已暂停",
+        STATUS_CANCELED: "已取消"
+    })
+    
+    # 进度落库阈值：累计变化超过该字节数或距上次写入超过该秒数时才写数据库
+    PROGRESS_FLUSH_BYTES = 1 << 20
+    PROGRESS_FLUSH_SECS = 1.0
+    
+    # 批量更新时每条语句包含的最大ID数量（SQLite默认最多999个绑定参数）
+    BULK_CHUNK_SIZE = 500
+    
     def __init__(self, task_data: Dict[str, Any] = None):
         """初始化下载任务模型
         
@@ -37,8 +235,15 @@ class DownloadTask:
         self.updated_at = None
         self.completed_at = None
         
+        # 最近一次写入数据库的进度，用于合并频繁的进度更新
+        self._last_flush_ts = 0.0
+        self._last_flush_bytes = 0
+        
         if task_data:
             self._populate_from_dict(task_data)
+        
+        # 最近一次与数据库同步时的字段值，save() 据此只写入变化的字段
+        self._clean = self._get_fields(self) if self.id else None
     
     def _populate_from_dict(self, data: Dict[str, Any]) -> None:
         """从字典填充任务数据
@@ -59,26 +264,81 @@ class DownloadTask:
         self.updated_at = data.get('updated_at')
         self.completed_at = data.get('completed_at')
     
+    @classmethod
+    def _from_row_tuple(cls, row) -> 'DownloadTask':
+        """从按 FIELDS 顺序排列的数据行快速构建任务对象
+        
+        Args:
+            row: 数据行
+            
+        Returns:
+            DownloadTask: 任务对象
+        """
+        obj = cls.__new__(cls)
+        obj._set_row(row)
+        return obj
+    
+    def _set_row(self, row) -> None:
+        """用按 FIELDS 顺序排列的数据行填充字段
+        
+        Args:
+            row: 数据行
+        """
+        (self.id, self.user_id, self.task_name, self.file_url, self.file_path,
+         self.file_size, self.downloaded_size, self.status, self.error_message,
+         self.created_at, self.updated_at, self.completed_at) = row
+        self._clean = tuple(row)
+        self._last_flush_ts = 0.0
+        self._last_flush_bytes = self.downloaded_size
+    
+    @classmethod
+    def acquire(cls, row) -> 'DownloadTask':
+        """从对象池获取任务对象
+        
+        池中对象会被复用，只能作为临时的只读视图使用，用完需调用 release()。
+        
+        Args:
+            row: 按 FIELDS 顺序排列的数据行
+            
+        Returns:
+            DownloadTask: 任务对象
+        """
+        return _task_pool.acquire(row)
+    
+    @classmethod
+    def release(cls, obj: 'DownloadTask') -> None:
+        """将 acquire() 获取的任务对象归还对象池
+        
+        Args:
+            obj: 任务对象
+        """
+        _task_pool.release(obj)
+    
+    @classmethod
+    @contextmanager
+    def view(cls, rows):
+        """以对象池中的对象临时包装数据行，退出时统一归还
+        
+        Args:
+            rows: 按 FIELDS 顺序排列的数据行列表
+            
+        Yields:
+            List[DownloadTask]: 任务对象列表
+        """
+        tasks = list(map(_task_pool.acquire, rows))
+        try:
+            yield tasks
+        finally:
+            for task in tasks:
+                _task_pool.release(task)
+    
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典
         
         Returns:
             Dict[str, Any]: 任务数据字典
         """
-        return {
-            'id': self.id,
-            'user_id': self.user_id,
-            'task_name': self.task_name,
-            'file_url': self.file_url,
-            'file_path': self.file_path,
-            'file_size': self.file_size,
-            'downloaded_size': self.downloaded_size,
-            'status': self.status,
-            'error_message': self.error_message,
-            'created_at': self.created_at,
-            'updated_at': self.updated_at,
-            'completed_at': self.completed_at
-        }
+        return dict(zip(self.FIELDS, self._get_fields(self)))
     
     @property
     def progress(self) -> float:
@@ -91,6 +351,18 @@ class DownloadTask:
             return 0
         return min(100, (self.downloaded_size / self.file_size) * 100)
     
+    @property
+    def progress_permille(self) -> int:
+        """整数表示的下载进度
+        
+        Returns:
+            int: 进度千分比 (0-1000)
+        """
+        file_size = self.file_size
+        if file_size <= 0:
+            return 0
+        return min(1000, (self.downloaded_size * 1000) // file_size)
+    
     @property
     def progress_text(self) -> str:
         """格式化的进度文本
@@ -98,7 +370,8 @@ class DownloadTask:
         Returns:
             str: 格式化的进度
         """
-        return f"{self.progress:.1f}%"
+        permille = self.progress_permille
+        return f"{permille // 10}.{permille % 10}%"
     
     @property
     def is_completed(self) -> bool:
@@ -134,7 +407,7 @@ class DownloadTask:
         Returns:
             bool: 是否活动中
         """
-        return self.status in [self.STATUS_DOWNLOADING, self.STATUS_PENDING]
+        return self.status in self._ACTIVE_STATES
     
     @property
     def can_resume(self) -> bool:
@@ -143,7 +416,7 @@ class DownloadTask:
         Returns:
             bool: 是否可以恢复
         """
-        return self.status in [self.STATUS_PAUSED, self.STATUS_FAILED]
+        return self.status in self._RESUMABLE_STATES
     
     @property
     def can_restart(self) -> bool:
@@ -152,7 +425,7 @@ class DownloadTask:
         Returns:
             bool: 是否可以重新开始
         """
-        return self.status in [self.STATUS_COMPLETED, self.STATUS_FAILED, self.STATUS_CANCELED]
+        return self.status in self._RESTARTABLE_STATES
     
     @property
     def filename(self) -> str:
@@ -202,17 +475,11 @@ class DownloadTask:
         Returns:
             str: 状态描述
         """
-        status_map = {
-            self.STATUS_PENDING: "等待下载",
-            self.STATUS_DOWNLOADING: "下载中",
-            self.STATUS_COMPLETED: "已完成",
-            self.STATUS_FAILED: "下载失败",
-            self.STATUS_PAUSED: "已暂停",
-            self.STATUS_CANCELED: "已取消"
-        }
-        return status_map.get(self.status, self.status)
+        return self.STATUS_TEXT_MAP.get(self.status, self.status)
     
-    def _format_size(self, size_bytes: int) -> str:
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _format_size(size_bytes: int) -> str:
         """格式化字节大小为易读字符串
         
         Args:
@@ -224,13 +491,9 @@ class DownloadTask:
         if size_bytes <= 0:
             return "0 B"
             
-        units = ['B', 'KB', 'MB', 'GB', 'TB']
-        i = 0
-        while size_bytes >= 1024 and i < len(units) - 1:
-            size_bytes /= 1024
-            i += 1
-            
-        return f"{size_bytes:.2f} {units[i]}"
+        # 根据二进制位数直接确定单位，无需循环相除
+        i = min((int(size_bytes).bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)
+        return f"{size_bytes / _SIZE_THRESHOLDS[i]:.2f} {_SIZE_UNITS[i]}"
     
     def save(self) -> bool:
         """保存任务数据
@@ -238,47 +501,29 @@ class DownloadTask:
         Returns:
             bool: 是否成功
         """
-        current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        
+        # 时间戳由SQLite生成（本地时间）
         if self.id:
-            # 更新现有任务
-            query = """
-                UPDATE download_tasks SET
-                    user_id = ?,
-                    task_name = ?,
-                    file_url = ?,
-                    file_path = ?,
-                    file_size = ?,
-                    downloaded_size = ?,
-                    status = ?,
-                    error_message = ?,
-                    updated_at = ?,
-                    completed_at = ?
-                WHERE id = ?
-            """
-            params = (
-                self.user_id,
-                self.task_name,
-                self.file_url,
-                self.file_path,
-                self.file_size,
-                self.downloaded_size,
-                self.status,
-                self.error_message,
-                current_time,
-                self.completed_at,
-                self.id
-            )
-            db.execute(query, params)
+            # 更新现有任务，只写入自上次同步以来变化的字段
+            current = self._get_fields(self)
+            columns = self._changed_fields(current)
+            if not columns:
+                return True
+            
+            params = []
+            for column in columns:
+                if column == 'completed_at':
+                    params.extend((self.status, self.completed_at, self.completed_at))
+                else:
+                    params.append(getattr(self, column))
+            params.append(self.id)
+            
+            db.execute(_build_update_sql(columns), tuple(params))
+            _lookup_cache.invalidate()
+            self._clean = current
+            self._mark_progress_flushed()
             return True
         else:
             # 创建新任务
-            query = """
-                INSERT INTO download_tasks (
-                    user_id, task_name, file_url, file_path, file_size,
-                    downloaded_size, status, error_message, created_at, updated_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """
             params = (
                 self.user_id,
                 self.task_name,
@@ -287,14 +532,50 @@ class DownloadTask:
                 self.file_size,
                 self.downloaded_size,
                 self.status,
-                self.error_message,
-                current_time,
-                current_time
+                self.error_message
             )
-            cursor = db.execute(query, params)
+            cursor = db.execute(_SQL_INSERT_TASK, params)
+            _lookup_cache.invalidate()
             self.id = cursor.lastrowid
+            self._clean = self._get_fields(self)
             return True
     
+    def _changed_fields(self, current: Tuple) -> Tuple[str, ...]:
+        """计算需要写入数据库的字段
+        
+        Args:
+            current: 当前字段值，按 FIELDS 顺序排列
+            
+        Returns:
+            Tuple[str, ...]: 变化的字段，按 _UPDATABLE_FIELDS 顺序排列
+        """
+        clean = self._clean
+        if clean is None:
+            return _UPDATABLE_FIELDS
+        
+        index = self._FIELD_INDEX
+        changed = {
+            column for column in _UPDATABLE_FIELDS
+            if current[index[column]] != clean[index[column]]
+        }
+        # 状态变化时需要同时维护完成时间
+        if 'status' in changed:
+            changed.add('completed_at')
+        return tuple(column for column in _UPDATABLE_FIELDS if column in changed)
+    
+    def _mark_synced(self, *columns: str) -> None:
+        """记录指定字段已写入数据库
+        
+        Args:
+            *columns: 字段名
+        """
+        if self._clean is None:
+            return
+        clean = list(self._clean)
+        for column in columns:
+            clean[self._FIELD_INDEX[column]] = getattr(self, column)
+        self._clean = tuple(clean)
+    
     def update_progress(self, downloaded_size: int, file_size: Optional[int] = None) -> None:
         """更新下载进度
         
@@ -312,35 +593,56 @@ class DownloadTask:
         
         # 检查是否下载完成
         if self.file_size > 0 and self.downloaded_size >= self.file_size:
-            self.mark_as_completed()
-        else:
+            self._complete_with_progress()
+        elif (self.downloaded_size - self._last_flush_bytes >= self.PROGRESS_FLUSH_BYTES
+              or time.monotonic() - self._last_flush_ts >= self.PROGRESS_FLUSH_SECS):
             # 只更新进度，不更新状态
             self._update_progress_only()
     
+    def flush_progress(self) -> None:
+        """立即将内存中的下载进度写入数据库"""
+        self._update_progress_only()
+    
     def _update_progress_only(self) -> None:
         """仅更新下载进度信息，不修改其他字段"""
-        current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        
         if self.id:
-            query = """
-                UPDATE download_tasks SET
-                    downloaded_size = ?,
-                    file_size = ?,
-                    updated_at = ?
-                WHERE id = ?
-            """
             params = (
                 self.downloaded_size,
                 self.file_size,
-                current_time,
                 self.id
             )
-            db.execute(query, params)
+            db.execute(_SQL_UPDATE_PROGRESS, params)
+            _lookup_cache.invalidate()
+            self._mark_synced('downloaded_size', 'file_size')
+            self._mark_progress_flushed()
+    
+    def _set_completed_at(self) -> None:
+        """未设置完成时间时记为当前本地时间，与写入数据库的值一致"""
+        if self.completed_at is None:
+            self.completed_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    
+    def _complete_with_progress(self) -> None:
+        """用一条UPDATE同时写入最终进度和完成状态"""
+        self.status = self.STATUS_COMPLETED
+        self._set_completed_at()
+        if self.id:
+            db.execute(
+                _SQL_COMPLETE_PROGRESS,
+                (self.downloaded_size, self.file_size, self.completed_at, self.id)
+            )
+            _lookup_cache.invalidate()
+            self._mark_synced('downloaded_size', 'file_size', 'status', 'completed_at')
+            self._mark_progress_flushed()
+    
+    def _mark_progress_flushed(self) -> None:
+        """记录当前进度已写入数据库"""
+        self._last_flush_ts = time.monotonic()
+        self._last_flush_bytes = self.downloaded_size
     
     def mark_as_completed(self) -> None:
         """标记任务为已完成"""
         self.status = self.STATUS_COMPLETED
-        self.completed_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        self._set_completed_at()
         self.save()
     
     def mark_as_failed(self, error_message: str) -> None:
@@ -389,8 +691,69 @@ class DownloadTask:
             
         query = "DELETE FROM download_tasks WHERE id = ?"
         db.execute(query, (self.id,))
+        _lookup_cache.invalidate()
         return True
     
+    @classmethod
+    def bulk_update_status(cls, ids: List[int], status: str, error_message: Optional[str] = None) -> int:
+        """批量更新任务状态
+        
+        Args:
+            ids: 任务ID列表
+            status: 新状态
+            error_message: 错误信息
+            
+        Returns:
+            int: 更新的任务数量
+        """
+        if not ids:
+            return 0
+            
+        updated = 0
+        # 所有分批语句在同一事务中提交
+        with db.transaction():
+            for start in range(0, len(ids), cls.BULK_CHUNK_SIZE):
+                chunk = list(ids[start:start + cls.BULK_CHUNK_SIZE])
+                placeholders = ", ".join("?" * len(chunk))
+                query = f"""
+                    UPDATE download_tasks SET
+                        status = ?,
+                        error_message = ?,
+                        updated_at = strftime('%Y-%m-%d %H:%M:%S', 'now', 'localtime'),
+                        completed_at = CASE
+                            WHEN ? = 'completed' THEN COALESCE(completed_at, strftime('%Y-%m-%d %H:%M:%S', 'now', 'localtime'))
+                            ELSE completed_at
+                        END
+                    WHERE id IN ({placeholders})
+                """
+                cursor = db.execute(query, (status, error_message, status, *chunk))
+                updated += cursor.rowcount
+        _lookup_cache.invalidate()
+        return updated
+    
+    @classmethod
+    def bulk_update_progress(cls, rows: List[Tuple[int, int, int]]) -> None:
+        """批量更新任务进度
+        
+        Args:
+            rows: (任务ID, 已下载大小, 文件总大小) 列表
+        """
+        if not rows:
+            return
+        
+        # 同一任务出现多次时以最后一条为准
+        latest = {task_id: (downloaded_size, file_size) for task_id, downloaded_size, file_size in rows}
+        items = [(task_id, *sizes) for task_id, sizes in latest.items()]
+        
+        # 每批多个任务合并为一条语句，所有批次在同一事务中提交
+        chunk_size = MAX_VARIABLES // 3
+        with db.transaction():
+            for start in range(0, len(items), chunk_size):
+                chunk = items[start:start + chunk_size]
+                params = tuple(value for item in chunk for value in item)
+                db.execute(_build_bulk_progress_sql(len(chunk)), params)
+        _lookup_cache.invalidate()
+    
     @classmethod
     def get_by_id(cls, task_id: int) -> Optional['DownloadTask']:
         """通过ID获取任务
@@ -402,7 +765,9 @@ class DownloadTask:
             Optional[DownloadTask]: 任务对象，不存在时返回None
         """
         query = "SELECT * FROM download_tasks WHERE id = ?"
-        result = db.query_one(query, (task_id,))
+        result = _lookup_cache.get_or_load(
+            ('id', task_id), lambda: db.query_one(query, (task_id,))
+        )
         if result:
             return cls(result)
         return None
@@ -420,10 +785,13 @@ class DownloadTask:
         """
         if user_id:
             query = "SELECT * FROM download_tasks WHERE file_url = ? AND user_id = ?"
-            result = db.query_one(query, (file_url, user_id))
+            params = (file_url, user_id)
         else:
             query = "SELECT * FROM download_tasks WHERE file_url = ?"
-            result = db.query_one(query, (file_url,))
+            params = (file_url,)
+        result = _lookup_cache.get_or_load(
+            ('url',) + params, lambda: db.query_one(query, params)
+        )
             
         if result:
             return cls(result)
@@ -456,9 +824,8 @@ class DownloadTask:
         Returns:
             List[DownloadTask]: 任务对象列表
         """
-        query = "SELECT * FROM download_tasks ORDER BY id DESC LIMIT ? OFFSET ?"
-        results = db.query_all(query, (limit, offset))
-        return [cls(result) for result in results]
+        rows = db.query_rows(_SQL_SELECT_ALL, (limit, offset))
+        return list(map(cls._from_row_tuple, rows))
     
     @classmethod
     def get_by_user(cls, user_id: int, limit: int = 100, offset: int = 0) -> List['DownloadTask']:
@@ -472,13 +839,28 @@ class DownloadTask:
         Returns:
             List[DownloadTask]: 任务对象列表
         """
-        query = """
-            SELECT * FROM download_tasks 
-            WHERE user_id = ? 
-            ORDER BY id DESC LIMIT ? OFFSET ?
+        rows = db.query_rows(_SQL_SELECT_BY_USER, (user_id, limit, offset))
+        return list(map(cls._from_row_tuple, rows))
+    
+    @classmethod
+    def iter_by_user(cls, user_id: int, chunk_size: int = 500) -> Iterator['DownloadTask']:
+        """逐批读取用户的全部任务
+        
+        按 chunk_size 分批从游标读取，内存中只保留当前批次的数据行。
+        
+        Args:
+            user_id: 用户ID
+            chunk_size: 每批读取的行数
+            
+        Yields:
+            DownloadTask: 任务对象
         """
-        results = db.query_all(query, (user_id, limit, offset))
-        return [cls(result) for result in results]
+        cursor = db.execute(_SQL_ITER_BY_USER, (user_id,))
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield from map(cls._from_row_tuple, rows)
     
     @classmethod
     def get_by_status(cls, status: str, user_id: Optional[int] = None) -> List['DownloadTask']:
@@ -492,21 +874,11 @@ class DownloadTask:
             List[DownloadTask]: 任务对象列表
         """
         if user_id:
-            query = """
-                SELECT * FROM download_tasks 
-                WHERE status = ? AND user_id = ? 
-                ORDER BY id DESC
-            """
-            results = db.query_all(query, (status, user_id))
+            rows = db.query_rows(_SQL_SELECT_BY_STATUS_USER, (status, user_id))
         else:
-            query = """
-                SELECT * FROM download_tasks 
-                WHERE status = ? 
-                ORDER BY id DESC
-            """
-            results = db.query_all(query, (status,))
+            rows = db.query_rows(_SQL_SELECT_BY_STATUS, (status,))
             
-        return [cls(result) for result in results]
+        return list(map(cls._from_row_tuple, rows))
     
     @classmethod
     def get_active_tasks(cls) -> List['DownloadTask']:
@@ -515,13 +887,8 @@ class DownloadTask:
         Returns:
             List[DownloadTask]: 任务对象列表
         """
-        query = """
-            SELECT * FROM download_tasks 
-            WHERE status IN (?, ?) 
-            ORDER BY updated_at DESC
-        """
-        results = db.query_all(query, (cls.STATUS_DOWNLOADING, cls.STATUS_PAUSED))
-        return [cls(result) for result in results]
+        rows = db.query_rows(_SQL_SELECT_ACTIVE)
+        return list(map(cls._from_row_tuple, rows))
     
     @classmethod
     def count_by_status(cls, status: str, user_id: Optional[int] = None) -> int:
@@ -547,4 +914,8 @@ class DownloadTask:
             """
             result = db.query_one(query, (status,))
             
-        return result.get('count', 0) if result else 0 
\ No newline at end of file
+        return result.get('count', 0) if result else 0 
+
+
+# 任务对象池
+_task_pool = _DownloadTaskPool(DownloadTask)
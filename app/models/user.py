@@ -1,13 +1,47 @@
 from typing import Optional, Dict, Any, List
-from datetime import datetime
-import time
+from operator import attrgetter
 
-from ..utils.database import db
+from ..utils.database import db, QueryCache
+
+
+# 常用SQL语句，模块级常量避免每次调用重新构建字符串，便于命中连接的语句缓存
+_SQL_UPDATE_USER = """
+    UPDATE users SET
+        phone = ?,
+        username = ?,
+        nickname = ?,
+        avatar = ?,
+        token = ?,
+        updated_at = strftime('%Y-%m-%d %H:%M:%S', 'now', 'localtime')
+    WHERE id = ?
+"""
+
+_SQL_INSERT_USER = """
+    INSERT INTO users (
+        phone, username, nickname, avatar, token, created_at, updated_at
+    ) VALUES (?, ?, ?, ?, ?,
+        strftime('%Y-%m-%d %H:%M:%S', 'now', 'localtime'),
+        strftime('%Y-%m-%d %H:%M:%S', 'now', 'localtime')
+    )
+"""
+
+# get_by_token 的短时查询缓存，用户有写操作时整体失效
+_token_cache = QueryCache(ttl=1.0)
 
 
 class User:
     """用户模型类"""
     
+    # 数据库字段
+    FIELDS = (
+        'id', 'phone', 'username', 'nickname', 'avatar', 'token',
+        'created_at', 'updated_at'
+    )
+    
+    __slots__ = FIELDS
+    
+    _get_fields = attrgetter(*FIELDS)
+    
     def __init__(self, user_data: Dict[str, Any] = None):
         """初始化用户模型
         
@@ -47,16 +81,7 @@ class User:
         Returns:
             Dict[str, Any]: 用户数据字典
         """
-        return {
-            'id': self.id,
-            'phone': self.phone,
-            'username': self.username,
-            'nickname': self.nickname,
-            'avatar': self.avatar,
-            'token': self.token,
-            'created_at': self.created_at,
-            'updated_at': self.updated_at
-        }
+        return dict(zip(self.FIELDS, self._get_fields(self)))
     
     def save(self) -> bool:
         """保存用户数据
@@ -64,48 +89,31 @@ class User:
         Returns:
             bool: 是否成功
         """
-        current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        
+        # 时间戳由SQLite生成（本地时间）
         if self.id:
             # 更新现有用户
-            query = """
-                UPDATE users SET
-                    phone = ?,
-                    username = ?,
-                    nickname = ?,
-                    avatar = ?,
-                    token = ?,
-                    updated_at = ?
-                WHERE id = ?
-            """
             params = (
                 self.phone,
                 self.username,
                 self.nickname,
                 self.avatar,
                 self.token,
-                current_time,
                 self.id
             )
-            db.execute(query, params)
+            db.execute(_SQL_UPDATE_USER, params)
+            _token_cache.invalidate()
             return True
         else:
             # 创建新用户
-            query = """
-                INSERT INTO users (
-                    phone, username, nickname, avatar, token, created_at, updated_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?)
-            """
             params = (
                 self.phone,
                 self.username,
                 self.nickname,
                 self.avatar,
-                self.token,
-                current_time,
-                current_time
+                self.token
             )
-            cursor = db.execute(query, params)
+            cursor = db.execute(_SQL_INSERT_USER, params)
+            _token_cache.invalidate()
             self.id = cursor.lastrowid
             return True
     
@@ -120,6 +128,7 @@ class User:
             
         query = "DELETE FROM users WHERE id = ?"
         db.execute(query, (self.id,))
+        _token_cache.invalidate()
         return True
     
     @classmethod
@@ -165,7 +174,7 @@ class User:
             Optional[User]: 用户对象，不存在时返回None
         """
         query = "SELECT * FROM users WHERE token = ?"
-        result = db.query_one(query, (token,))
+        result = _token_cache.get_or_load(token, lambda: db.query_one(query, (token,)))
         if result:
             return cls(result)
         return None
@@ -181,6 +190,21 @@ class User:
         results = db.query_all(query)
         return [cls(result) for result in results]
     
+    @classmethod
+    def get_latest(cls) -> Optional['User']:
+        """获取最近登录的用户
+        
+        登录时会保存用户并刷新 updated_at，因此按 updated_at 取最新的一条。
+        
+        Returns:
+            Optional[User]: 用户对象，不存在时返回None
+        """
+        query = "SELECT * FROM users ORDER BY updated_at DESC, id DESC LIMIT 1"
+        result = db.query_one(query)
+        if result:
+            return cls(result)
+        return None
+    
     @classmethod
     def save_from_api_response(cls, user_info: Dict[str, Any], token: str) -> 'User':
         """从API响应保存用户
@@ -1,4 +1,7 @@
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
+import asyncio
+import hashlib
+import time
 from .base import BaseAPIService
 
 
@@ -8,6 +11,29 @@ class AuthAPIService(BaseAPIService):
     提供登录、获取验证码等认证相关的API调用
     """
     
+    # token验证结果的缓存时间（秒）
+    TOKEN_CACHE_TTL = 60.0
+    
+    def __init__(self):
+        """初始化认证API服务"""
+        super().__init__()
+        # token摘要 -> (缓存时间, 验证结果)
+        self._token_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        # token摘要 -> 进行中的验证任务，同一token的并发验证共用一次请求
+        self._token_inflight: Dict[str, asyncio.Future] = {}
+    
+    @staticmethod
+    def _token_key(token: str) -> str:
+        """计算token的缓存键，避免在内存中以明文作为键保存token
+        
+        Args:
+            token: 认证令牌
+            
+        Returns:
+            str: token摘要
+        """
+        return hashlib.sha256(token.encode()).hexdigest()
+    
     async def request_verification_code(self, phone: str) -> Dict[str, Any]:
         """请求手机验证码
         
@@ -74,6 +100,8 @@ class AuthAPIService(BaseAPIService):
     async def validate_token(self, token: str) -> Dict[str, Any]:
         """验证token是否有效
         
+        验证结果在 TOKEN_CACHE_TTL 秒内缓存，同一token的并发验证只发送一次请求。
+        
         Args:
             token: 认证令牌
             
@@ -83,6 +111,39 @@ class AuthAPIService(BaseAPIService):
         Raises:
             Exception: 当API调用失败时抛出异常
         """
+        key = self._token_key(token)
+        cached = self._token_cache.get(key)
+        if cached and time.monotonic() - cached[0] < self.TOKEN_CACHE_TTL:
+            return cached[1]
+        
+        inflight = self._token_inflight.get(key)
+        if inflight is None:
+            inflight = asyncio.ensure_future(self._request_validate_token(token, key))
+            self._token_inflight[key] = inflight
+            inflight.add_done_callback(lambda _: self._token_inflight.pop(key, None))
+        return await asyncio.shield(inflight)
+    
+    def invalidate_token(self, token: Optional[str] = None) -> None:
+        """清除token验证缓存
+        
+        Args:
+            token: 认证令牌，为None时清除全部缓存
+        """
+        if token is None:
+            self._token_cache.clear()
+        else:
+            self._token_cache.pop(self._token_key(token), None)
+    
+    async def _request_validate_token(self, token: str, key: str) -> Dict[str, Any]:
+        """请求服务端验证token，成功时写入缓存
+        
+        Args:
+            token: 认证令牌
+            key: token摘要，作为缓存键
+            
+        Returns:
+            Dict[str, Any]: 包含验证结果的字典
+        """
         try:
             endpoint = "/auth/validate-token"
             headers = {"Authorization": f"Bearer {token}"}
@@ -96,6 +157,9 @@ class AuthAPIService(BaseAPIService):
             )
             
             self.logger.info("Token validation successful")
+            self._token_cache[key] = (time.monotonic(), response)
             return response
         except Exception as e:
-            self._handle_error(e, "Failed to validate token") 
\ No newline at end of file
+            # 验证失败（如401）时丢弃旧的缓存结果
+            self._token_cache.pop(key, None)
+            self._handle_error(e, "Failed to validate token")
@@ -1,8 +1,17 @@
 from typing import Optional, Dict, Any
+import asyncio
+import threading
 from ...utils.http import HTTPClient
-from ...config import settings
+from ...config import get_settings
 from ...utils.logger import api_logger
 
+# 保护共享HTTP客户端的创建
+_client_lock = threading.Lock()
+
+
+class APIError(Exception):
+    """API调用失败时抛出的异常"""
+
 
 class BaseAPIService:
     """API服务基类
@@ -10,17 +19,79 @@ class BaseAPIService:
     提供基础的API调用功能，所有具体的API服务类都应该继承这个类。
     """
     
+    # 所有API服务共享的HTTP客户端，首次使用时创建
+    _client: Optional[HTTPClient] = None
+    
     def __init__(self):
         """初始化API服务
         
-        创建HTTP客户端并设置基础URL
+        获取共享的HTTP客户端
         """
-        self.client = HTTPClient(
-            base_url=settings.API_BASE_URL,
-            timeout=settings.API_TIMEOUT
-        )
+        self.client = type(self)._get_client()
         self.logger = api_logger
 
+    @classmethod
+    def _get_client(cls) -> HTTPClient:
+        """获取共享的HTTP客户端，所有子类共用同一个连接池
+        
+        Returns:
+            HTTPClient: HTTP客户端
+        """
+        client = BaseAPIService._client
+        if client is None:
+            with _client_lock:
+                client = BaseAPIService._client
+                if client is None:
+                    client = HTTPClient(
+                        base_url=get_settings().API_BASE_URL,
+                        timeout=get_settings().API_TIMEOUT
+                    )
+                    BaseAPIService._client = client
+        return client
+
+    @classmethod
+    async def close(cls) -> None:
+        """关闭共享的HTTP客户端"""
+        client = BaseAPIService._client
+        if client is not None:
+            await client.close()
+
+    @classmethod
+    def shutdown(cls, timeout: float = 5.0) -> None:
+        """在应用退出流程中关闭共享HTTP客户端的会话
+        
+        会话必须在创建它的事件循环中关闭：该循环在其他线程中运行时提交过去执行，
+        未运行时在当前线程中运行到关闭完成。
+        
+        Args:
+            timeout: 等待关闭完成的最长时间（秒）
+        """
+        client = BaseAPIService._client
+        if client is None or client.session is None or client.session.closed:
+            return
+        
+        loop = client.session_loop
+        if loop is None or loop.is_closed():
+            api_logger.warning("HTTP会话所属的事件循环已关闭，无法关闭会话")
+            return
+        
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        
+        try:
+            if running is loop:
+                # 当前线程正在运行该循环（如Qt与asyncio共用线程），不能阻塞等待
+                loop.create_task(client.close())
+            elif loop.is_running():
+                future = asyncio.run_coroutine_threadsafe(client.close(), loop)
+                future.result(timeout=timeout)
+            else:
+                loop.run_until_complete(client.close())
+        except Exception as e:
+            api_logger.error("关闭HTTP会话失败: %s", e)
+
     def _handle_error(self, error: Exception, context: str = "") -> None:
         """统一的错误处理方法
         
@@ -30,9 +101,9 @@ class BaseAPIService:
         """
         error_msg = f"{context} - Error: {str(error)}"
         self.logger.error(error_msg)
-        if settings.SHOW_DETAILED_ERRORS:
+        if get_settings().SHOW_DETAILED_ERRORS:
             raise error
-        raise Exception(error_msg)
+        raise APIError(error_msg) from error
 
     async def make_request(
         self,
@@ -55,7 +126,7 @@ class BaseAPIService:
             Dict[str, Any]: API响应数据
         """
         try:
-            return self.client.request(
+            return await self.client.request(
                 method=method,
                 endpoint=endpoint,
                 params=params,
@@ -63,4 +134,4 @@ class BaseAPIService:
                 **kwargs
             )
         except Exception as e:
-            self._handle_error(e, f"Failed to {method} {endpoint}") 
\ No newline at end of file
+            self._handle_error(e, f"Failed to {method} {endpoint}")
@@ -1,4 +1,6 @@
 from typing import Dict, Any, List, Optional
+import asyncio
+import math
 from .base import BaseAPIService
 
 
@@ -37,6 +39,41 @@ class DraftService(BaseAPIService):
         
         return await self.make_request('GET', self.base_endpoint, params=params)
 
+    async def get_all_drafts(
+        self,
+        page_size: int = 50,
+        filters: Optional[Dict[str, Any]] = None,
+        max_concurrency: int = 8
+    ) -> List[Dict[str, Any]]:
+        """获取全部草稿
+        
+        先请求第一页得到总数，其余页面并发请求。
+        
+        Args:
+            page_size: 每页数量
+            filters: 过滤条件
+            max_concurrency: 最大并发请求数
+            
+        Returns:
+            List[Dict[str, Any]]: 全部草稿数据
+        """
+        first = await self.get_drafts(1, page_size, filters)
+        items = list(first.get('items', []))
+        pages = math.ceil(first.get('total', 0) / page_size)
+        if pages <= 1:
+            return items
+        
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def fetch(page: int) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.get_drafts(page, page_size, filters)
+        
+        rest = await asyncio.gather(*(fetch(page) for page in range(2, pages + 1)))
+        for result in rest:
+            items.extend(result.get('items', []))
+        return items
+
     async def get_draft(self, draft_id: str) -> Dict[str, Any]:
         """获取单个草稿详情
         
@@ -85,17 +122,80 @@ class DraftService(BaseAPIService):
         endpoint = f"{self.base_endpoint}/{draft_id}"
         return await self.make_request('DELETE', endpoint)
 
-    async def batch_delete_drafts(self, draft_ids: List[str]) -> Dict[str, Any]:
+    async def batch_delete_drafts(
+        self,
+        draft_ids: List[str],
+        chunk_size: int = 500,
+        max_concurrency: int = 4
+    ) -> Dict[str, Any]:
         """批量删除草稿
         
+        ID列表按 chunk_size 分批，各批次并发请求。
+        只有一批时直接返回服务器的响应；多批时以第一个成功批次的响应为基础，
+        附加各ID的删除结果，部分批次失败不影响其他批次的结果。
+        
         Args:
             draft_ids: 草稿ID列表
+            chunk_size: 每批请求包含的最大ID数量
+            max_concurrency: 最大并发请求数
             
         Returns:
-            Dict[str, Any]: 批量删除操作的响应数据
+            Dict[str, Any]: 批量删除操作的响应数据；多批时额外包含
+                succeeded_ids（删除成功的ID）、failed_ids（删除失败的ID）
+                和 errors（失败批次的ID及错误信息）
+            
+        Raises:
+            APIError: 只有一批或所有批次都失败时抛出
         """
-        return await self.make_request(
-            'DELETE',
-            f"{self.base_endpoint}/batch",
-            data={'ids': draft_ids}
-        ) 
\ No newline at end of file
+        chunks = [draft_ids[i:i + chunk_size] for i in range(0, len(draft_ids), chunk_size)]
+        
+        # 只有一批时与单次请求的行为一致
+        if len(chunks) <= 1:
+            return await self.make_request(
+                'DELETE',
+                f"{self.base_endpoint}/batch",
+                data={'ids': draft_ids}
+            )
+        
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def delete_chunk(ids: List[str]) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.make_request(
+                    'DELETE',
+                    f"{self.base_endpoint}/batch",
+                    data={'ids': ids}
+                )
+        
+        results = await asyncio.gather(
+            *(delete_chunk(ids) for ids in chunks),
+            return_exceptions=True
+        )
+        
+        merged: Optional[Dict[str, Any]] = None
+        succeeded_ids: List[str] = []
+        failed_ids: List[str] = []
+        errors: List[Dict[str, Any]] = []
+        first_error: Optional[BaseException] = None
+        for ids, result in zip(chunks, results):
+            if isinstance(result, BaseException):
+                first_error = first_error or result
+                failed_ids.extend(ids)
+                errors.append({'ids': ids, 'error': str(result)})
+                continue
+            if merged is None:
+                merged = dict(result) if isinstance(result, dict) else {}
+            succeeded_ids.extend(ids)
+        
+        # 全部失败时与单次请求一样抛出异常
+        if merged is None:
+            raise first_error
+        
+        if errors:
+            self.logger.error(f"批量删除草稿部分失败: {len(failed_ids)}/{len(draft_ids)}")
+        merged.update({
+            'succeeded_ids': succeeded_ids,
+            'failed_ids': failed_ids,
+            'errors': errors
+        })
+        return merged
@@ -1,11 +1,38 @@
-import os
-import json
+import re
 import asyncio
-from typing import Dict, Any, Optional, Callable, Tuple
+import inspect
+from contextlib import contextmanager
+from contextvars import ContextVar
+from types import MappingProxyType
+from typing import Dict, Any, Optional, Callable, Tuple, Mapping
+import aiohttp
 from .api.auth_api import AuthAPIService
+from .api.base import APIError
 from ..utils.logger import service_logger
 from ..models.user import User
 
+# 中国大陆11位手机号
+_PHONE_RE = re.compile(r'1[3-9][0-9]{9}')
+
+# 6位数字验证码
+_CODE_RE = re.compile(r'[0-9]{6}')
+
+# API调用可能抛出的异常，其余异常视为程序错误直接向上抛出
+_API_ERRORS = (APIError, aiohttp.ClientError, asyncio.TimeoutError, ValueError)
+
+# 当前上下文（asyncio任务）临时指定的用户，未设置时使用全局登录用户
+_current_user_var: ContextVar[Optional[User]] = ContextVar('current_user')
+
+# 响应字段缺失时使用的共享空映射，避免每次分配新的字典
+_EMPTY = MappingProxyType({})
+
+# 常见校验失败的返回结果，直接复用
+_PHONE_INVALID_MESSAGE = "手机号格式不正确"
+_CODE_INVALID_MESSAGE = "验证码必须是6位数字"
+_VERIFICATION_PHONE_INVALID = (False, _PHONE_INVALID_MESSAGE)
+_LOGIN_PHONE_INVALID = (False, _EMPTY, _PHONE_INVALID_MESSAGE)
+_LOGIN_CODE_INVALID = (False, _EMPTY, _CODE_INVALID_MESSAGE)
+
 
 class AuthService:
     """认证服务
@@ -13,14 +40,86 @@ class AuthService:
     处理用户认证相关的业务逻辑，如登录、注销、验证码请求等
     """
     
+    __slots__ = (
+        '_api_service', 'logger',
+        '_verification_callbacks', '_login_callbacks', '_logout_callbacks',
+        '_verification_async_callbacks', '_login_async_callbacks', '_logout_async_callbacks',
+        '_current_user', '_user_info'
+    )
+    
     def __init__(self):
         """初始化认证服务"""
-        self.api_service = AuthAPIService()
+        # API服务在首次使用时创建
+        self._api_service: Optional[AuthAPIService] = None
         self.logger = service_logger
-        self._verification_callbacks = []
-        self._login_callbacks = []
-        self._logout_callbacks = []
+        # 回调以元组保存，注册时整体替换（写时复制），通知时无需再拷贝
+        # 同步回调与协程回调分开保存，注册时判断一次类型
+        self._verification_callbacks: Tuple[Callable, ...] = ()
+        self._login_callbacks: Tuple[Callable, ...] = ()
+        self._logout_callbacks: Tuple[Callable, ...] = ()
+        self._verification_async_callbacks: Tuple[Callable, ...] = ()
+        self._login_async_callbacks: Tuple[Callable, ...] = ()
+        self._logout_async_callbacks: Tuple[Callable, ...] = ()
         self._current_user = None
+        # 当前用户信息的只读视图，登录状态变化时重新生成
+        self._user_info: Mapping[str, Any] = _EMPTY
+    
+    def _set_current_user(self, user: Optional[User]) -> None:
+        """设置当前用户并刷新缓存的用户信息
+        
+        Args:
+            user: 用户对象，None表示未登录
+        """
+        self._current_user = user
+        self._user_info = MappingProxyType(user.to_dict()) if user else _EMPTY
+    
+    @property
+    def api_service(self) -> AuthAPIService:
+        """认证API服务，首次访问时创建
+        
+        Returns:
+            AuthAPIService: 认证API服务
+        """
+        api_service = self._api_service
+        if api_service is None:
+            api_service = self._api_service = AuthAPIService()
+        return api_service
+    
+    def _get_user(self) -> Optional[User]:
+        """获取当前生效的用户：优先使用上下文中指定的用户
+        
+        Returns:
+            Optional[User]: 用户对象
+        """
+        return _current_user_var.get(self._current_user)
+    
+    @contextmanager
+    def user_context(self, user: Optional[User]):
+        """在当前上下文中临时以指定用户身份执行
+        
+        只影响当前asyncio任务及其创建的子任务，不改变全局登录状态。
+        
+        Args:
+            user: 用户对象
+        """
+        token = _current_user_var.set(user)
+        try:
+            yield user
+        finally:
+            _current_user_var.reset(token)
+    
+    def _register_callback(self, kind: str, callback: Callable) -> None:
+        """按回调类型追加到对应的回调元组
+        
+        Args:
+            kind: 回调类别（verification / login / logout）
+            callback: 回调函数，可以是普通函数或协程函数
+        """
+        if inspect.iscoroutinefunction(callback):
+            attr = f"_{kind}_async_callbacks"
+        else:
+            attr = f"_{kind}_callbacks"
+        setattr(self, attr, getattr(self, attr) + (callback,))
     
     def register_verification_callback(self, callback: Callable[[bool, str], None]) -> None:
         """注册验证码发送结果回调
@@ -28,7 +127,7 @@ class AuthService:
         Args:
             callback: 回调函数，接收成功状态和消息
         """
-        self._verification_callbacks.append(callback)
+        self._register_callback("verification", callback)
     
     def register_login_callback(self, callback: Callable[[bool, Dict[str, Any], str], None]) -> None:
         """注册登录状态变更回调
@@ -36,7 +135,7 @@ class AuthService:
         Args:
             callback: 回调函数，接收成功状态、用户信息和消息
         """
-        self._login_callbacks.append(callback)
+        self._register_callback("login", callback)
     
     def register_logout_callback(self, callback: Callable[[], None]) -> None:
         """注册登出回调
@@ -44,7 +143,73 @@ class AuthService:
         Args:
             callback: 回调函数
         """
-        self._logout_callbacks.append(callback)
+        self._register_callback("logout", callback)
+    
+    def _run_sync_callbacks(self, kind: str, callbacks: Tuple[Callable, ...], args: Tuple) -> None:
+        """依次执行同步回调
+        
+        Args:
+            kind: 回调类别，用于日志
+            callbacks: 回调元组
+            args: 回调参数
+        """
+        for callback in callbacks:
+            try:
+                callback(*args)
+            except Exception as e:
+                self.logger.error("Error in %s callback: %s", kind, e)
+    
+    def _log_async_callback_errors(self, kind: str, future: asyncio.Future) -> None:
+        """记录协程回调中的异常
+        
+        Args:
+            kind: 回调类别，用于日志
+            future: gather 返回的future
+        """
+        if future.cancelled():
+            return
+        for result in future.result():
+            if isinstance(result, Exception):
+                self.logger.error("Error in %s callback: %s", kind, result)
+    
+    def _dispatch_callbacks(
+        self,
+        kind: str,
+        callbacks: Tuple[Callable, ...],
+        async_callbacks: Tuple[Callable, ...],
+        *args
+    ) -> None:
+        """分发回调，不阻塞调用方
+        
+        同步回调合并为一次 call_soon 在事件循环中执行；协程回调通过 gather 并发执行。
+        没有运行中的事件循环时同步回调直接执行。
+        
+        Args:
+            kind: 回调类别
+            callbacks: 同步回调元组
+            async_callbacks: 协程回调元组
+            *args: 回调参数
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        
+        if callbacks:
+            if loop is None:
+                self._run_sync_callbacks(kind, callbacks, args)
+            else:
+                loop.call_soon(self._run_sync_callbacks, kind, callbacks, args)
+        
+        if async_callbacks:
+            if loop is None:
+                self.logger.warning("No running event loop, skipped %d async %s callbacks", len(async_callbacks), kind)
+                return
+            future = asyncio.gather(
+                *(callback(*args) for callback in async_callbacks),
+                return_exceptions=True
+            )
+            future.add_done_callback(lambda f: self._log_async_callback_errors(kind, f))
     
     def _notify_verification_callbacks(self, success: bool, message: str) -> None:
         """通知验证码回调
@@ -53,11 +218,12 @@ class AuthService:
             success: 是否成功
             message: 消息
         """
-        for callback in self._verification_callbacks:
-            try:
-                callback(success, message)
-            except Exception as e:
-                self.logger.error(f"Error in verification callback: {str(e)}")
+        self._dispatch_callbacks(
+            "verification",
+            self._verification_callbacks,
+            self._verification_async_callbacks,
+            success, message
+        )
     
     def _notify_login_callbacks(self, success: bool, user_info: Dict[str, Any], message: str) -> None:
         """通知登录回调
@@ -67,35 +233,36 @@ class AuthService:
             user_info: 用户信息
             message: 消息
         """
-        for callback in self._login_callbacks:
-            try:
-                callback(success, user_info, message)
-            except Exception as e:
-                self.logger.error(f"Error in login callback: {str(e)}")
+        self._dispatch_callbacks(
+            "login",
+            self._login_callbacks,
+            self._login_async_callbacks,
+            success, user_info, message
+        )
     
     def _notify_logout_callbacks(self) -> None:
         """通知登出回调"""
-        for callback in self._logout_callbacks:
-            try:
-                callback()
-            except Exception as e:
-                self.logger.error(f"Error in logout callback: {str(e)}")
+        self._dispatch_callbacks(
+            "logout",
+            self._logout_callbacks,
+            self._logout_async_callbacks
+        )
     
-    async def request_verification_code(self, phone: str) -> Tuple[bool, str]:
+    async def request_verification_code(self, phone: str, skip_local_validation: bool = False) -> Tuple[bool, str]:
         """请求验证码
         
         Args:
             phone: 手机号码
+            skip_local_validation: 调用方已校验过手机号时跳过本地格式检查
             
         Returns:
             Tuple[bool, str]: (是否成功, 消息)
         """
         try:
             # 验证手机号格式
-            if not self._validate_phone(phone):
-                message = "手机号格式不正确"
-                self._notify_verification_callbacks(False, message)
-                return False, message
+            if not skip_local_validation and not self._validate_phone(phone):
+                self._notify_verification_callbacks(False, _PHONE_INVALID_MESSAGE)
+                return _VERIFICATION_PHONE_INVALID
             
             # 调用API获取验证码
             response = await self.api_service.request_verification_code(phone)
@@ -110,65 +277,72 @@ class AuthService:
                 self._notify_verification_callbacks(False, message)
                 return False, message
                 
-        except Exception as e:
+        except _API_ERRORS as e:
             message = f"获取验证码出错: {str(e)}"
             self.logger.error(message)
             self._notify_verification_callbacks(False, message)
             return False, message
     
-    async def login(self, phone: str, code: str) -> Tuple[bool, Dict[str, Any], str]:
+    async def login(self, phone: str, code: str, skip_local_validation: bool = False) -> Tuple[bool, Mapping[str, Any], str]:
         """使用验证码登录
         
         Args:
             phone: 手机号码
             code: 验证码
+            skip_local_validation: 调用方已校验过手机号时跳过本地格式检查
             
         Returns:
-            Tuple[bool, Dict[str, Any], str]: (是否成功, 用户信息, 消息)
+            Tuple[bool, Mapping[str, Any], str]: (是否成功, 用户信息, 消息)
         """
         try:
             # 验证手机号和验证码
-            if not self._validate_phone(phone):
-                message = "手机号格式不正确"
-                self._notify_login_callbacks(False, {}, message)
-                return False, {}, message
+            if not skip_local_validation and not self._validate_phone(phone):
+                self._notify_login_callbacks(False, _EMPTY, _PHONE_INVALID_MESSAGE)
+                return _LOGIN_PHONE_INVALID
                 
-            if not code or len(code.strip()) != 6:
-                message = "验证码必须是6位数字"
-                self._notify_login_callbacks(False, {}, message)
-                return False, {}, message
+            # 调用方负责去除首尾空白（界面层已 strip）
+            if not code or _CODE_RE.fullmatch(code) is None:
+                self._notify_login_callbacks(False, _EMPTY, _CODE_INVALID_MESSAGE)
+                return _LOGIN_CODE_INVALID
             
             # 调用API登录
             response = await self.api_service.login_with_verification_code(phone, code)
             
             # 检查响应
-            if response.get("success", False):
+            response_get = response.get
+            if response_get("success", False):
                 # 提取用户信息和令牌
-                user_info = response.get("data", {}).get("user_info", {})
-                token = response.get("data", {}).get("token", "")
+                data = response_get("data") or _EMPTY
+                data_get = data.get
+                user_info = data_get("user_info") or _EMPTY
+                token = data_get("token", "")
                 
-                # 保存到数据库
-                user = User.save_from_api_response(user_info, token)
-                self._current_user = user
+                # 保存到数据库，写入放到线程池执行，避免阻塞事件循环
+                user = await asyncio.get_running_loop().run_in_executor(
+                    None, User.save_from_api_response, user_info, token
+                )
+                self._set_current_user(user)
                 
+                # 回调与返回值共用同一份只读用户信息
                 message = "登录成功"
-                self._notify_login_callbacks(True, user.to_dict(), message)
-                return True, user.to_dict(), message
+                self._notify_login_callbacks(True, self._user_info, message)
+                return True, self._user_info, message
             else:
-                message = response.get("message", "登录失败")
-                self._notify_login_callbacks(False, {}, message)
-                return False, {}, message
+                message = response_get("message", "登录失败")
+                self._notify_login_callbacks(False, _EMPTY, message)
+                return False, _EMPTY, message
                 
-        except Exception as e:
+        except _API_ERRORS as e:
             message = f"登录出错: {str(e)}"
             self.logger.error(message)
-            self._notify_login_callbacks(False, {}, message)
-            return False, {}, message
+            self._notify_login_callbacks(False, _EMPTY, message)
+            return False, _EMPTY, message
     
     def logout(self) -> None:
         """退出登录"""
         if self._current_user:
-            self._current_user = None
+            self._set_current_user(None)
+            self.api_service.invalidate_token()
             self._notify_logout_callbacks()
             self.logger.info("User logged out")
     
@@ -178,17 +352,18 @@ class AuthService:
         Returns:
             bool: 是否已登录
         """
-        return self._current_user is not None
+        return self._get_user() is not None
     
-    def get_user_info(self) -> Dict[str, Any]:
+    def get_user_info(self) -> Mapping[str, Any]:
         """获取用户信息
         
         Returns:
-            Dict[str, Any]: 用户信息
+            Mapping[str, Any]: 用户信息（只读）
         """
-        if self._current_user:
-            return self._current_user.to_dict()
-        return {}
+        user = self._get_user()
+        if user is self._current_user:
+            return self._user_info
+        return MappingProxyType(user.to_dict()) if user else _EMPTY
     
     def get_token(self) -> Optional[str]:
         """获取认证令牌
@@ -196,8 +371,9 @@ class AuthService:
         Returns:
             Optional[str]: 认证令牌
         """
-        if self._current_user:
-            return self._current_user.token
+        user = self._get_user()
+        if user:
+            return user.token
         return None
     
     def get_current_user(self) -> Optional[User]:
@@ -206,7 +382,7 @@ class AuthService:
         Returns:
             Optional[User]: 用户对象
         """
-        return self._current_user
+        return self._get_user()
     
     def get_current_user_id(self) -> Optional[int]:
         """获取当前用户ID
@@ -214,8 +390,9 @@ class AuthService:
         Returns:
             Optional[int]: 用户ID
         """
-        if self._current_user:
-            return self._current_user.id
+        user = self._get_user()
+        if user:
+            return user.id
         return None
     
     async def validate_current_token(self) -> bool:
@@ -227,14 +404,16 @@ class AuthService:
         token = self.get_token()
         if not token:
             return False
-            
+        
+        # 结果缓存和并发验证合并由 AuthAPIService.validate_token 负责
         try:
             response = await self.api_service.validate_token(token)
-            return response.get("success", False)
-        except:
+        except _API_ERRORS:
             return False
+        return response.get("success", False)
     
-    def _validate_phone(self, phone: str) -> bool:
+    @staticmethod
+    def _validate_phone(phone: str) -> bool:
         """验证手机号格式
         
         Args:
@@ -243,22 +422,18 @@ class AuthService:
         Returns:
             bool: 是否为有效手机号
         """
-        # 简单验证手机号格式（中国大陆11位手机号）
-        if not phone or not phone.isdigit() or len(phone) != 11:
-            return False
-        return True
+        return bool(phone) and _PHONE_RE.fullmatch(phone) is not None
     
     def load_last_logged_in_user(self) -> None:
         """加载最后登录的用户"""
         try:
             # 查询最近登录的用户
-            users = User.get_all()
-            if users:
-                # 假设最近登录的用户在列表的第一个位置
-                self._current_user = users[0]
-                self.logger.info(f"加载最近登录用户: {self._current_user.username}")
+            user = User.get_latest()
+            if user:
+                self._set_current_user(user)
+                self.logger.info("加载最近登录用户: %s", user.username)
         except Exception as e:
-            self.logger.error(f"加载最近登录用户失败: {str(e)}")
+            self.logger.error("加载最近登录用户失败: %s", e)
 
 
 # 创建单例实例
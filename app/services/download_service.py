@@ -1,204 +1,690 @@
 import os
+import sys
+import struct
 import asyncio
 import time
-import multiprocessing
 import threading
-import signal
 import aiohttp
 import traceback
-import json
 from typing import Optional, Dict, Any, List, Callable, Tuple
+from concurrent.futures import Future
 from datetime import datetime
-from queue import Queue
+import queue
 import uuid
 import logging
 
 from ..utils.logger import service_logger
 from ..models.download_task import DownloadTask
 from ..models.user import User
-from ..config import settings
+from ..config import get_settings
 
+# 下载数据块的最小大小；块越大，每字节摊到的Python循环开销越小
+MIN_CHUNK = 1 << 18
 
-class DownloadProcess(multiprocessing.Process):
-    """下载进程类，用于在单独进程中处理下载任务"""
+# 下载过程中报告进度的间隔
+PROGRESS_INTERVAL = 0.5
+
+# 每读取约 1MB 数据才取一次时间，避免每个数据块都调用时钟
+TIME_SAMPLE_BYTES = 1 << 20
+
+# 分段下载时每个 Range 请求的区间大小
+PARALLEL_PIECE_SIZE = 8 << 20
+
+# 下载进度写入数据库的间隔：超过 2 秒或新增超过 8MB 时才保存一次
+PERSIST_INTERVAL = 2.0
+PERSIST_BYTES = 8 << 20
+
+
+def _preallocate(fileno: int, size: int) -> None:
+    """为文件一次性预分配磁盘空间，避免边写边扩展文件带来的元数据更新和碎片
+    
+    Linux 上使用 posix_fallocate（会把文件大小扩展到 size），
+    macOS 上使用 F_PREALLOCATE（只分配空间，不改变文件大小）；
+    其他平台或文件系统不支持时忽略。
+    
+    Args:
+        fileno: 文件描述符
+        size: 预分配的大小
+    """
+    try:
+        if hasattr(os, 'posix_fallocate'):
+            os.posix_fallocate(fileno, 0, size)
+        elif sys.platform == 'darwin':
+            import fcntl
+            # fstore_t: fst_flags, fst_posmode, fst_offset, fst_length, fst_bytesalloc
+            # F_ALLOCATEALL = 4, F_PEOFPOSMODE = 3
+            fstore = struct.pack('Iiqqq', 4, 3, 0, size, 0)
+            fcntl.fcntl(fileno, getattr(fcntl, 'F_PREALLOCATE', 42), fstore)
+    except OSError:
+        # tmpfs 等文件系统不支持预分配
+        pass
+
+
+# 各下载任务复用的写入缓冲区，避免每个数据块都分配新的内存
+_buffer_pool: "queue.SimpleQueue[bytearray]" = queue.SimpleQueue()
+
+
+def _acquire_buffer(size: int) -> bytearray:
+    """从缓冲区池取出一个缓冲区，池中没有合适的缓冲区时新建
+    
+    Args:
+        size: 缓冲区大小
+        
+    Returns:
+        bytearray: 缓冲区
+    """
+    try:
+        buf = _buffer_pool.get_nowait()
+    except queue.Empty:
+        return bytearray(size)
+    if len(buf) != size:
+        return bytearray(size)
+    return buf
+
+
+def _release_buffer(buf: bytearray) -> None:
+    """把缓冲区放回池中，池已满时直接丢弃
+    
+    Args:
+        buf: 缓冲区
+    """
+    # 每个下载连接最多同时占用两个缓冲区
+    settings = get_settings()
+    if _buffer_pool.qsize() < settings.DOWNLOAD_CONCURRENT_COUNT * settings.DOWNLOAD_PARALLEL_SEGMENTS * 2:
+        _buffer_pool.put(buf)
+
+
+def _write_at(file, data: memoryview, offset: int) -> None:
+    """在文件指定位置写入全部数据，在线程池中调用
+    
+    支持 pwrite 的平台直接按位置写入，不经过文件对象的缓冲区，也不需要移动文件位置。
+    
+    Args:
+        file: 以无缓冲方式打开的二进制文件
+        data: 要写入的数据
+        offset: 写入位置
+    """
+    if hasattr(os, 'pwrite'):
+        fd = file.fileno()
+        while data:
+            written = os.pwrite(fd, data, offset)
+            data = data[written:]
+            offset += written
+    else:
+        file.seek(offset)
+        while data:
+            written = file.write(data)
+            data = data[written:]
+
+
+class _BufferedFileWriter:
+    """把网络数据攒满预分配的缓冲区后交给线程池写入文件
     
-    def __init__(self, task_id: int, file_url: str, file_path: str, 
-                 downloaded_size: int = 0, pipe_conn=None):
-        """初始化下载进程
+    两个缓冲区交替使用：一个在线程池中写入磁盘时，另一个继续接收网络数据。
+    每次写入都带有文件位置，同一文件上的多个写入器互不影响。
+    """
+    
+    __slots__ = ('_file', '_loop', '_size', '_buf', '_spare', '_length', '_offset', '_pending')
+    
+    def __init__(self, file, loop: asyncio.AbstractEventLoop, size: int, offset: int = 0):
+        """初始化写入器
+        
+        Args:
+            file: 以无缓冲方式打开的二进制文件
+            loop: 事件循环
+            size: 缓冲区大小
+            offset: 开始写入的文件位置
+        """
+        self._file = file
+        self._loop = loop
+        self._size = size
+        self._buf = _acquire_buffer(size)
+        self._spare = _acquire_buffer(size)
+        self._length = 0
+        self._offset = offset
+        self._pending = None
+    
+    async def write(self, data: bytes) -> None:
+        """追加数据，缓冲区写满时提交写入
+        
+        Args:
+            data: 网络数据
+        """
+        view = memoryview(data)
+        while view:
+            n = min(self._size - self._length, len(view))
+            self._buf[self._length:self._length + n] = view[:n]
+            self._length += n
+            view = view[n:]
+            if self._length == self._size:
+                await self._submit()
+    
+    async def _submit(self) -> None:
+        """把当前缓冲区交给线程池写入，并切换到另一个缓冲区
+        
+        等待写入时使用 shield，任务被取消后写入仍会完成，关闭前可以再次等待。
+        """
+        if self._pending:
+            await asyncio.shield(self._pending)
+            self._pending = None
+        if self._length:
+            buf = self._buf
+            self._pending = self._loop.run_in_executor(
+                None, _write_at, self._file, memoryview(buf)[:self._length], self._offset
+            )
+            self._buf, self._spare = self._spare, buf
+            self._offset += self._length
+            self._length = 0
+    
+    async def seek(self, offset: int) -> None:
+        """写入缓冲区中的数据后，把之后的写入位置移到 offset
+        
+        Args:
+            offset: 新的写入位置
+        """
+        await self.flush()
+        self._offset = offset
+    
+    async def flush(self) -> None:
+        """写入缓冲区中的全部数据并等待完成"""
+        await self._submit()
+        if self._pending:
+            await asyncio.shield(self._pending)
+            self._pending = None
+    
+    async def close(self) -> None:
+        """写入剩余数据并归还缓冲区
+        
+        flush 被取消时仍等待线程池中的写入结束后才归还缓冲区，
+        避免缓冲区在写入途中被其他下载取用，或文件在写入途中被关闭。
+        """
+        try:
+            await self.flush()
+        finally:
+            await self._wait_pending()
+            _release_buffer(self._buf)
+            _release_buffer(self._spare)
+            self._buf = self._spare = None
+    
+    async def _wait_pending(self) -> None:
+        """等待进行中的写入结束，期间收到的取消在写入结束后再抛出"""
+        pending = self._pending
+        if pending is None:
+            return
+        interrupted = False
+        while not pending.done():
+            try:
+                await asyncio.wait((pending,))
+            except asyncio.CancelledError:
+                interrupted = True
+        self._pending = None
+        # 写入异常已无人等待，取出避免未读取异常的告警
+        if not pending.cancelled():
+            pending.exception()
+        if interrupted:
+            raise asyncio.CancelledError()
+
+
+class DownloadJob:
+    """单个下载任务的执行体，在下载服务的事件循环线程中运行
+    
+    暂停、恢复和取消通过 loop.call_soon_threadsafe 调用对应方法，
+    进度和状态通过回调直接交给下载服务处理。
+    """
+    
+    def __init__(self, task_id: int, file_url: str, file_path: str,
+                 downloaded_size: int = 0,
+                 on_progress: Callable[[int, int, Optional[int]], None] = None,
+                 on_status: Callable[[int, str, str, Optional[int]], None] = None):
+        """初始化下载执行体
         
         Args:
             task_id: 任务ID
             file_url: 文件URL
             file_path: 保存路径
             downloaded_size: 已下载大小，用于断点续传
-            pipe_conn: 管道连接，用于和主进程通信
+            on_progress: 进度回调，参数为 (任务ID, 已下载大小, 文件总大小)
+            on_status: 状态回调，参数为 (任务ID, 状态, 详细信息, 已下载大小)
         """
-        super().__init__()
         self.task_id = task_id
         self.file_url = file_url
         self.file_path = file_path
         self.downloaded_size = downloaded_size
-        self.pipe_conn = pipe_conn
-        self.daemon = True  # 设置为守护进程
-        self.stop_event = multiprocessing.Event()
-        self.pause_event = multiprocessing.Event()
-        
-    def run(self):
-        """进程运行入口"""
-        try:
-            # 设置信号处理
-            signal.signal(signal.SIGTERM, self.handle_terminate)
-            
-            # 确保目标目录存在
-            os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
-            
-            # 执行下载
-            self.download_file()
-            
-        except Exception as e:
-            error_msg = f"下载进程异常: {str(e)}\n{traceback.format_exc()}"
-            self.send_status("error", error_msg)
-            
-    def handle_terminate(self, signum, frame):
-        """处理终止信号"""
-        self.stop_event.set()
-        
+        self.on_progress = on_progress
+        self.on_status = on_status
+        # 当前已写入文件的大小，下载过程中持续更新，供下载速度等查询直接读取
+        self.downloaded = downloaded_size
+        self.paused = False
+        self.canceled = False
+        # 以下对象在事件循环线程中创建
+        self._task: Optional[asyncio.Task] = None
+        self._resume_event: Optional[asyncio.Event] = None
+    
+    def pause(self) -> None:
+        """暂停下载，需在事件循环线程中调用"""
+        self.paused = True
+        if self._resume_event is not None:
+            self._resume_event.clear()
+    
+    def resume(self) -> None:
+        """恢复下载，需在事件循环线程中调用"""
+        self.paused = False
+        if self._resume_event is not None:
+            self._resume_event.set()
+    
+    def cancel(self) -> None:
+        """取消下载，需在事件循环线程中调用"""
+        if self.canceled:
+            return
+        self.canceled = True
+        if self._task is not None:
+            self._task.cancel()
+    
     def send_progress(self, downloaded_size, file_size=None):
-        """发送进度信息到主进程
+        """报告进度
         
         Args:
             downloaded_size: 已下载大小
             file_size: 文件总大小，可选
         """
-        if self.pipe_conn:
-            data = {
-                "type": "progress",
-                "task_id": self.task_id,
-                "downloaded_size": downloaded_size
-            }
-            if file_size is not None:
-                data["file_size"] = file_size
-                
-            self.pipe_conn.send(json.dumps(data))
-            
-    def send_status(self, status, message=""):
-        """发送状态信息到主进程
+        if self.on_progress:
+            self.on_progress(self.task_id, downloaded_size, file_size)
+    
+    def send_status(self, status, message="", downloaded_size=None):
+        """报告状态
         
         Args:
             status: 状态名称
             message: 状态详细信息
+            downloaded_size: 当前已下载大小，可选
         """
-        if self.pipe_conn:
-            data = {
-                "type": "status",
-                "task_id": self.task_id,
-                "status": status,
-                "message": message
-            }
-            self.pipe_conn.send(json.dumps(data))
-            
-    def download_file(self):
-        """执行文件下载"""
-        import requests
+        if self.on_status:
+            self.on_status(self.task_id, status, message, downloaded_size)
+    
+    async def run(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore):
+        """下载入口，超出并发数时在信号量上排队
+        
+        Args:
+            session: 下载服务共享的HTTP会话
+            semaphore: 限制同时下载数量的信号量
+        """
+        # 开始运行前已收到取消，此时 cancel() 还没有可取消的任务
+        if self.canceled:
+            self.send_status("canceled", "下载已取消", self.downloaded)
+            return
+        
+        self._task = asyncio.current_task()
+        self._resume_event = asyncio.Event()
+        if not self.paused:
+            self._resume_event.set()
+        
+        try:
+            async with semaphore:
+                # 目标目录已由下载服务创建
+                await self._download_async(session)
+        except asyncio.CancelledError:
+            if self.canceled:
+                self.send_status("canceled", "下载已取消", self.downloaded)
+            else:
+                # 服务关闭时被中断，记录为暂停，下次启动可以继续下载
+                self.send_status("paused", "下载已中断", self.downloaded)
+                raise
+        except Exception as e:
+            error_msg = f"下载异常: {str(e)}\n{traceback.format_exc()}"
+            self.send_status("error", error_msg)
+    
+    async def _wait_if_paused(self, writer: "_BufferedFileWriter") -> None:
+        """暂停时先把已接收的数据写入磁盘，再等待恢复
         
+        Args:
+            writer: 当前的文件写入器
+        """
+        if self._resume_event.is_set():
+            return
+        await writer.flush()
+        self.send_status("paused", "下载已暂停", self.downloaded)
+        await self._resume_event.wait()
+        self.send_status("downloading", "下载已恢复")
+    
+    async def _download_async(self, session: aiohttp.ClientSession):
+        """异步下载文件：网络读取与磁盘写入交替重叠进行
+        
+        Args:
+            session: HTTP会话
+        """
         self.send_status("downloading", "开始下载")
         
         # 配置请求头，支持断点续传
+        # 新下载也带上 Range，由响应判断服务器是否支持分段下载，不再单独发送 HEAD 请求
         headers = {}
         if self.downloaded_size > 0:
             headers['Range'] = f'bytes={self.downloaded_size}-'
-            
+        elif get_settings().DOWNLOAD_PARALLEL_SEGMENTS >= 2:
+            headers['Range'] = 'bytes=0-'
+        
+        loop = asyncio.get_running_loop()
+        
         try:
-            # 创建会话对象
-            session = requests.Session()
+            async with session.get(self.file_url, headers=headers) as response:
+                if response.status not in (200, 206):
+                    error_msg = f"下载失败，HTTP状态码: {response.status}"
+                    self.send_status("error", error_msg)
+                    return
+                
+                # 新下载的大文件在服务器支持 Range 时改为分段并发下载，当前响应作为第一个区间
+                if self.downloaded_size == 0 and response.status == 206:
+                    total_size = self._parallel_total_size(response)
+                    if total_size:
+                        await self._download_parallel(session, total_size, response)
+                        return
+                
+                # 获取文件总大小
+                file_size = int(response.headers.get('Content-Length', 0))
+                if file_size > 0:
+                    total_size = self.downloaded_size + file_size
+                    self.send_progress(self.downloaded_size, total_size)
+                else:
+                    # 如果服务器未返回内容长度
+                    total_size = None
+                
+                # 数据块不小于 MIN_CHUNK，小文件则不超过文件本身大小
+                chunk_size = max(get_settings().DOWNLOAD_CHUNK_SIZE, MIN_CHUNK)
+                if file_size > 0:
+                    chunk_size = min(chunk_size, file_size)
+                
+                # 进度按间隔保存，文件中可能多出未记录的数据，续传前截断到已记录的位置
+                if (self.downloaded_size > 0 and os.path.exists(self.file_path)
+                        and os.path.getsize(self.file_path) > self.downloaded_size):
+                    os.truncate(self.file_path, self.downloaded_size)
+                
+                # 打开文件准备写入，数据由写入器攒满缓冲区后按位置写入，文件本身不再缓冲
+                # 预分配可能扩展文件大小，因此续传时按位置写入而不是追加
+                resuming = self.downloaded_size > 0 and os.path.exists(self.file_path)
+                file_mode = 'r+b' if resuming else 'wb'
+                with open(self.file_path, file_mode, buffering=0) as f:
+                    if total_size:
+                        _preallocate(f.fileno(), total_size)
+                    downloaded = self.downloaded_size
+                    # 上次报告进度的时间
+                    last_update_time = time.monotonic()
+                    # 每隔若干数据块取一次时间，其余数据块沿用上次的值
+                    sample_every = max(1, TIME_SAMPLE_BYTES // chunk_size)
+                    chunks_since_tick = 0
+                    # 网络数据先攒入缓冲区，写满后在读取下一块的同时写入磁盘
+                    writer = _BufferedFileWriter(f, loop, chunk_size, self.downloaded_size)
+                    
+                    try:
+                        async for chunk in response.content.iter_any():
+                            # 检查是否需要暂停
+                            await self._wait_if_paused(writer)
+                            
+                            if chunk:  # 过滤空数据块
+                                await writer.write(chunk)
+                                downloaded += len(chunk)
+                                self.downloaded = downloaded
+                                
+                                # 按间隔报告进度
+                                if chunks_since_tick % sample_every == 0:
+                                    current_time = time.monotonic()
+                                    if current_time - last_update_time >= PROGRESS_INTERVAL:
+                                        self.send_progress(downloaded, total_size)
+                                        last_update_time = current_time
+                                chunks_since_tick += 1
+                    finally:
+                        # 写入剩余数据并归还缓冲区
+                        await writer.close()
             
-            # 发送请求
-            response = session.get(
-                self.file_url, 
-                headers=headers,
-                stream=True,
-                timeout=settings.DOWNLOAD_TIMEOUT
+            # 下载完成，最终进度随完成状态一并发送
+            self.send_status("completed", "下载完成", downloaded)
+        
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            error_msg = f"请求错误: {str(e)}"
+            self.send_status("error", error_msg)
+    
+    def _parallel_total_size(self, response: aiohttp.ClientResponse) -> int:
+        """根据 Range 请求的响应判断是否可以分段下载
+        
+        Args:
+            response: 以 bytes=0- 请求得到的206响应
+        
+        Returns:
+            int: 可以分段下载时返回文件总大小，否则返回0
+        """
+        # Content-Range 格式为 bytes 0-999/1000，总大小未知时为 *
+        content_range = response.headers.get('Content-Range', '')
+        try:
+            total_size = int(content_range.rpartition('/')[2])
+        except ValueError:
+            return 0
+        
+        if total_size >= get_settings().DOWNLOAD_PARALLEL_MIN_SIZE:
+            return total_size
+        return 0
+    
+    async def _download_parallel(self, session: aiohttp.ClientSession, total_size: int,
+                                 first_response: aiohttp.ClientResponse):
+        """分段并发下载：把 [0, total_size) 划分为固定大小的区间，由多个连接按顺序领取，
+        各自发起 Range 请求写入文件对应位置
+        
+        每个连接在当前区间即将读完时提前发起下一个区间的请求，
+        让服务器准备响应的时间与本地写入重叠。
+        上报的进度为从文件开头起连续写完的字节数，保证中断后可以按该位置续传。
+        
+        Args:
+            session: HTTP会话
+            total_size: 文件总大小
+            first_response: 探测时得到的 bytes=0- 响应，只读取第一个区间的数据
+        """
+        connections = get_settings().DOWNLOAD_PARALLEL_SEGMENTS
+        chunk_size = max(get_settings().DOWNLOAD_CHUNK_SIZE, MIN_CHUNK)
+        bounds = list(range(0, total_size, PARALLEL_PIECE_SIZE)) + [total_size]
+        pieces = len(bounds) - 1
+        # 各区间已下载的字节数
+        done = [0] * pieces
+        # 按顺序分配区间，保证连续完成的部分尽快增长
+        piece_iter = iter(range(pieces))
+        loop = asyncio.get_running_loop()
+        # 最先发现暂停的连接负责报告暂停状态
+        pause_reported = False
+        
+        def contiguous_size() -> int:
+            """从文件开头起连续下载完成的字节数"""
+            size = 0
+            for i in range(pieces):
+                size = bounds[i] + done[i]
+                if size < bounds[i + 1]:
+                    break
+            return size
+        
+        async def open_piece(index: int) -> aiohttp.ClientResponse:
+            """发起单个区间的请求，返回已收到响应头的响应"""
+            if index == 0:
+                return first_response
+            start, end = bounds[index], bounds[index + 1]
+            response = await session.get(
+                self.file_url, headers={'Range': f'bytes={start}-{end - 1}'}
             )
-            
-            if response.status_code not in [200, 206]:
-                error_msg = f"下载失败，HTTP状态码: {response.status_code}"
-                self.send_status("error", error_msg)
+            if response.status != 206:
+                response.release()
+                raise aiohttp.ClientError(f"分段下载失败，HTTP状态码: {response.status}")
+            return response
+        
+        async def wait_if_paused(writer: _BufferedFileWriter):
+            """暂停时写入已接收的数据并等待恢复，由第一个发现暂停的连接报告状态"""
+            nonlocal pause_reported
+            if self._resume_event.is_set():
+                return
+            await writer.flush()
+            if not pause_reported:
+                pause_reported = True
+                self.downloaded = contiguous_size()
+                self.send_status("paused", "下载已暂停", self.downloaded)
+            await self._resume_event.wait()
+            if pause_reported:
+                pause_reported = False
+                self.send_status("downloading", "下载已恢复")
+        
+        async def fetch_worker():
+            """单个连接：依次下载领取到的区间"""
+            index = next(piece_iter, None)
+            if index is None:
                 return
+            request = asyncio.ensure_future(open_piece(index))
             
-            # 获取文件总大小
-            file_size = int(response.headers.get('Content-Length', 0))
-            if file_size > 0:
-                total_size = self.downloaded_size + file_size
-                self.send_progress(self.downloaded_size, total_size)
-            else:
-                # 如果服务器未返回内容长度
-                total_size = None
-                
-            # 打开文件准备写入
-            file_mode = 'ab' if self.downloaded_size > 0 else 'wb'
-            with open(self.file_path, file_mode) as f:
-                downloaded = self.downloaded_size
-                chunk_size = settings.DOWNLOAD_CHUNK_SIZE
-                last_update_time = time.time()
-                
-                for chunk in response.iter_content(chunk_size=chunk_size):
-                    # 检查是否需要停止
-                    if self.stop_event.is_set():
-                        self.send_status("canceled", "下载已取消")
-                        return
+            with open(self.file_path, 'r+b', buffering=0) as f:
+                writer = _BufferedFileWriter(f, loop, chunk_size)
+                try:
+                    while request is not None:
+                        response = await request
+                        request = None
+                        next_index = None
+                        start, end = bounds[index], bounds[index + 1]
                         
-                    # 检查是否需要暂停
-                    if self.pause_event.is_set():
-                        self.send_status("paused", "下载已暂停")
-                        # 等待恢复信号
-                        while self.pause_event.is_set() and not self.stop_event.is_set():
-                            time.sleep(0.1)
-                            
-                        if self.stop_event.is_set():
-                            self.send_status("canceled", "下载已取消")
-                            return
+                        async with response:
+                            # 上一区间的数据全部写入后再移动写入位置
+                            await writer.seek(start)
                             
-                        self.send_status("downloading", "下载已恢复")
-                    
-                    if chunk:  # 过滤空数据块
-                        f.write(chunk)
-                        downloaded += len(chunk)
+                            async for chunk in response.content.iter_any():
+                                await wait_if_paused(writer)
+                                # 第一个区间来自 bytes=0- 的响应，超出区间的数据丢弃
+                                remaining = end - start - done[index]
+                                if len(chunk) > remaining:
+                                    chunk = chunk[:remaining]
+                                await writer.write(chunk)
+                                done[index] += len(chunk)
+                                
+                                # 当前区间只剩最后一块时提前请求下一个区间
+                                if request is None and end - start - done[index] <= chunk_size:
+                                    next_index = next(piece_iter, None)
+                                    if next_index is not None:
+                                        request = asyncio.ensure_future(open_piece(next_index))
+                                
+                                if done[index] == end - start:
+                                    break
                         
-                        # 定期更新进度
-                        current_time = time.time()
-                        if current_time - last_update_time >= 0.3:  # 每0.3秒更新一次
-                            self.send_progress(downloaded, total_size)
-                            last_update_time = current_time
-            
-            # 下载完成
-            self.send_progress(downloaded, downloaded)
-            self.send_status("completed", "下载完成")
-            
-        except requests.exceptions.RequestException as e:
-            error_msg = f"请求错误: {str(e)}"
-            self.send_status("error", error_msg)
-        except Exception as e:
-            error_msg = f"下载错误: {str(e)}\n{traceback.format_exc()}"
-            self.send_status("error", error_msg)
+                        if done[index] != end - start:
+                            raise aiohttp.ClientError(f"分段数据不完整: {done[index]}/{end - start}")
+                        index = next_index
+                finally:
+                    # 关闭文件前写入剩余数据，并放弃已提前发起的请求
+                    await writer.close()
+                    if request is not None:
+                        request.cancel()
+                        for result in await asyncio.gather(request, return_exceptions=True):
+                            if isinstance(result, aiohttp.ClientResponse):
+                                result.release()
+        
+        # 预先分配文件大小，各分段直接写入对应位置
+        with open(self.file_path, 'wb') as f:
+            _preallocate(f.fileno(), total_size)
+            f.truncate(total_size)
+        self.send_progress(0, total_size)
+        
+        tasks = [asyncio.ensure_future(fetch_worker()) for _ in range(min(connections, pieces))]
+        pending = set(tasks)
+        
+        try:
+            # 定期报告连续完成的进度，直到全部区间下载完成
+            while pending:
+                finished, pending = await asyncio.wait(
+                    pending, timeout=PROGRESS_INTERVAL, return_when=asyncio.FIRST_EXCEPTION
+                )
+                # 任一连接失败时抛出异常
+                for task in finished:
+                    error = task.exception()
+                    if error is not None:
+                        raise error
+                if self._resume_event.is_set():
+                    self.downloaded = contiguous_size()
+                    self.send_progress(self.downloaded, total_size)
+        except BaseException:
+            # 取消或出错时停止其余连接，各连接关闭前会写入已接收的数据
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self.downloaded = contiguous_size()
+            raise
+        
+        self.downloaded = total_size
+        self.send_status("completed", "下载完成", total_size)
 
 
 class DownloadService:
-    """高级下载服务类，负责处理下载任务的业务逻辑"""
+    """高级下载服务类，负责处理下载任务的业务逻辑
+    
+    所有下载都在一个后台线程的事件循环中并发执行，共享同一个HTTP会话。
+    """
     
     def __init__(self):
         """初始化下载服务"""
         self.logger = service_logger
-        self.active_downloads = {}  # {task_id: 进程和管道信息}
+        self.active_downloads = {}  # {task_id: 任务、下载执行体和future}
+        # 调用方线程和下载线程都会修改 active_downloads，先检查再修改的操作需要加锁
+        self._active_lock = threading.RLock()
         self.progress_callbacks = []  # 进度回调函数列表
         self.status_callbacks = []  # 状态回调函数列表
+        self._ensured_dirs: set[str] = set()  # 本次运行中已确认存在的目录
         
         # 默认下载目录
         self.default_download_dir = os.path.join(os.path.expanduser("~"), "Downloads", "jy_draft")
-        os.makedirs(self.default_download_dir, exist_ok=True)
+        self._ensure_dir(self.default_download_dir)
+        
+        # 以下对象在事件循环线程中创建
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        
+        # 启动下载事件循环线程
+        self._loop = asyncio.new_event_loop()
+        self._loop_thread = threading.Thread(target=self._run_loop, daemon=True)
+        self._loop_thread.start()
+    
+    def _ensure_dir(self, path: str) -> None:
+        """确保目录存在，已确认的目录不再重复检查文件系统
+        
+        Args:
+            path: 目录路径
+        """
+        if path not in self._ensured_dirs:
+            os.makedirs(path, exist_ok=True)
+            self._ensured_dirs.add(path)
+    
+    def _run_loop(self) -> None:
+        """下载线程入口，运行事件循环直到服务关闭"""
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """获取共享的HTTP会话，首次调用时创建，连接和DNS解析结果在所有下载间复用
         
-        # 启动消息处理线程
-        self.message_thread = threading.Thread(target=self._process_messages, daemon=True)
-        self.message_thread.start()
+        Returns:
+            aiohttp.ClientSession: HTTP会话
+        """
+        if self._session is None or self._session.closed:
+            # 连接和单次读取分别超时，不限制整个下载的总时长
+            download_timeout = get_settings().DOWNLOAD_TIMEOUT
+            timeout = aiohttp.ClientTimeout(
+                total=None,
+                sock_connect=download_timeout,
+                sock_read=download_timeout
+            )
+            connector = aiohttp.TCPConnector(limit=32, ttl_dns_cache=300, keepalive_timeout=60)
+            self._session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+        return self._session
+    
+    async def _run_job(self, job: DownloadJob) -> None:
+        """在事件循环线程中执行下载，同时下载的数量由 DOWNLOAD_CONCURRENT_COUNT 限定
+        
+        Args:
+            job: 下载执行体
+        """
+        # 开始前已被取消，不再创建会话
+        if job.canceled:
+            job.send_status("canceled", "下载已取消", job.downloaded)
+            return
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(get_settings().DOWNLOAD_CONCURRENT_COUNT)
+        session = await self._get_session()
+        await job.run(session, self._semaphore)
     
     def register_progress_callback(self, callback: Callable[[DownloadTask], None]) -> None:
         """注册进度回调函数
@@ -241,116 +727,129 @@ class DownloadService:
             except Exception as e:
                 self.logger.error(f"状态回调错误: {str(e)}")
     
-    def _process_messages(self):
-        """处理来自下载进程的消息"""
-        while True:
-            try:
-                # 检查所有活动下载的管道
-                for task_id, download_info in list(self.active_downloads.items()):
-                    pipe_conn = download_info.get('pipe_conn')
-                    
-                    if pipe_conn and pipe_conn.poll():
-                        # 有消息可读
-                        try:
-                            message = pipe_conn.recv()
-                            self._handle_download_message(json.loads(message))
-                        except (EOFError, json.JSONDecodeError) as e:
-                            self.logger.error(f"读取下载进程消息错误: {str(e)}")
-                
-                # 清理已完成的进程
-                self._cleanup_finished_processes()
-                
-                # 短暂休眠，避免CPU占用过高
-                time.sleep(0.1)
-                
-            except Exception as e:
-                self.logger.error(f"消息处理线程异常: {str(e)}\n{traceback.format_exc()}")
-                time.sleep(1)  # 出错后稍长休眠
-    
-    def _handle_download_message(self, message):
-        """处理下载进程发送的消息
+    def _get_task(self, task_id: int) -> Optional[DownloadTask]:
+        """获取任务，活动下载直接使用缓存的任务对象，避免重复查询数据库
         
         Args:
-            message: 消息字典
+            task_id: 任务ID
+        
+        Returns:
+            Optional[DownloadTask]: 任务对象，不存在则返回None
         """
-        msg_type = message.get('type')
-        task_id = message.get('task_id')
+        download_info = self.active_downloads.get(task_id)
+        if download_info is not None:
+            task = download_info.get('task')
+            if task is not None:
+                return task
+        return DownloadTask.get_by_id(task_id)
+    
+    def _should_persist_progress(self, task_id: int, task: DownloadTask,
+                                 downloaded_size: int, file_size: Optional[int]) -> bool:
+        """判断本次进度是否需要写入数据库
         
-        if not task_id:
-            return
+        Args:
+            task_id: 任务ID
+            task: 下载任务
+            downloaded_size: 已下载大小
+            file_size: 文件总大小
             
-        task = DownloadTask.get_by_id(task_id)
+        Returns:
+            bool: 需要写入返回True
+        """
+        download_info = self.active_downloads.get(task_id)
+        if download_info is None:
+            return True
+        
+        # 下载完成的进度必须写入
+        total = file_size if file_size is not None else task.file_size
+        if total and downloaded_size >= total:
+            return True
+        
+        now = time.monotonic()
+        if (now - download_info.get('last_persist_ts', 0.0) > PERSIST_INTERVAL
+                or downloaded_size - download_info.get('last_persist_bytes', 0) > PERSIST_BYTES):
+            download_info['last_persist_ts'] = now
+            download_info['last_persist_bytes'] = downloaded_size
+            return True
+        return False
+    
+    def _on_download_progress(self, task_id: int, downloaded_size: int,
+                              file_size: Optional[int]) -> None:
+        """处理下载执行体报告的进度，在事件循环线程中调用
+        
+        Args:
+            task_id: 任务ID
+            downloaded_size: 已下载大小
+            file_size: 文件总大小
+        """
+        task = self._get_task(task_id)
         if not task:
             self.logger.error(f"无法找到任务: {task_id}")
             return
-            
-        if msg_type == 'progress':
-            # 处理进度更新
-            downloaded_size = message.get('downloaded_size', 0)
-            file_size = message.get('file_size')
-            
+        
+        # 暂停等状态下的进度由状态消息携带
+        if task.status != DownloadTask.STATUS_DOWNLOADING:
+            return
+        
+        if self._should_persist_progress(task_id, task, downloaded_size, file_size):
             task.update_progress(downloaded_size, file_size)
-            self._notify_progress(task)
-            
-        elif msg_type == 'status':
-            # 处理状态更新
-            status = message.get('status')
-            status_message = message.get('message', '')
-            
-            if status == 'downloading':
-                task.status = DownloadTask.STATUS_DOWNLOADING
-                task.save()
-            elif status == 'completed':
-                task.mark_as_completed()
-                # 完成后清理资源
-                self._cleanup_download(task_id)
-            elif status == 'paused':
-                task.mark_as_paused()
-            elif status == 'canceled':
-                task.mark_as_canceled()
-                # 取消后清理资源
-                self._cleanup_download(task_id)
-            elif status == 'error':
-                task.mark_as_failed(status_message)
-                # 错误后清理资源
-                self._cleanup_download(task_id)
-                
-            self._notify_status(task, status_message)
+        else:
+            # 只更新内存中的进度供回调使用，不写数据库
+            task.downloaded_size = downloaded_size
+            if file_size is not None:
+                task.file_size = file_size
+        self._notify_progress(task)
     
-    def _cleanup_download(self, task_id):
-        """清理下载资源
+    def _on_download_status(self, task_id: int, status: str, status_message: str,
+                            downloaded_size: Optional[int]) -> None:
+        """处理下载执行体报告的状态，在事件循环线程中调用
         
         Args:
             task_id: 任务ID
+            status: 状态名称
+            status_message: 状态详细信息
+            downloaded_size: 当前已下载大小，可选
         """
-        if task_id in self.active_downloads:
-            download_info = self.active_downloads[task_id]
-            process = download_info.get('process')
-            pipe_conn = download_info.get('pipe_conn')
-            
-            # 关闭管道
-            if pipe_conn:
-                try:
-                    pipe_conn.close()
-                except:
-                    pass
-            
-            # 清理进程
-            if process and process.is_alive():
-                try:
-                    process.terminate()
-                except:
-                    pass
-            
-            # 从活动下载中移除
-            del self.active_downloads[task_id]
+        task = self._get_task(task_id)
+        if not task:
+            self.logger.error(f"无法找到任务: {task_id}")
+            return
+        
+        # 状态携带的最终进度随状态在同一次保存中写入
+        if downloaded_size is not None:
+            task.downloaded_size = downloaded_size
+            if status == 'completed':
+                task.file_size = downloaded_size
+        
+        if status == 'downloading':
+            task.status = DownloadTask.STATUS_DOWNLOADING
+            task.save()
+        elif status == 'completed':
+            task.mark_as_completed()
+        elif status == 'paused':
+            task.mark_as_paused()
+        elif status == 'canceled':
+            task.mark_as_canceled()
+        elif status == 'error':
+            task.mark_as_failed(status_message)
+        
+        self._notify_status(task, status_message)
     
-    def _cleanup_finished_processes(self):
-        """清理已完成的进程"""
-        for task_id, download_info in list(self.active_downloads.items()):
-            process = download_info.get('process')
-            if process and not process.is_alive():
-                self._cleanup_download(task_id)
+    def _on_download_done(self, task_id: int, future: Future) -> None:
+        """下载结束后清理资源，在事件循环线程中调用
+        
+        Args:
+            task_id: 任务ID
+            future: 已结束的下载
+        """
+        if not future.cancelled() and future.exception():
+            self.logger.error(f"下载异常结束: {task_id}, 错误: {future.exception()}")
+        
+        with self._active_lock:
+            download_info = self.active_downloads.get(task_id)
+            # 任务已被清理或已重新开始
+            if download_info is not None and download_info.get('future') is future:
+                del self.active_downloads[task_id]
     
     async def create_download_task(
         self, 
@@ -390,7 +889,7 @@ class DownloadService:
             file_path = os.path.join(self.default_download_dir, filename)
         
         # 确保目标目录存在
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        self._ensure_dir(os.path.dirname(file_path))
         
         # 检查是否已存在相同URL的任务
         existing_task = DownloadTask.get_by_url(file_url, user_id)
@@ -427,11 +926,11 @@ class DownloadService:
         
         Args:
             task_id: 任务ID
-            
+        
         Raises:
             ValueError: 任务不存在或无法开始
         """
-        task = DownloadTask.get_by_id(task_id)
+        task = self._get_task(task_id)
         if not task:
             raise ValueError(f"任务不存在: {task_id}")
         
@@ -441,58 +940,57 @@ class DownloadService:
             return
         
         # 检查是否已经在活动下载列表中
-        if task_id in self.active_downloads:
-            download_info = self.active_downloads[task_id]
-            process = download_info.get('process')
+        download_info = self.active_downloads.get(task_id)
+        if download_info is not None:
+            future = download_info.get('future')
             
-            if process and process.is_alive():
+            if future and not future.done():
                 # 如果处于暂停状态，恢复下载
                 if task.status == DownloadTask.STATUS_PAUSED:
-                    pause_event = download_info.get('pause_event')
-                    if pause_event:
-                        pause_event.clear()  # 清除暂停标志
-                        
-                        # 更新任务状态
-                        task.status = DownloadTask.STATUS_DOWNLOADING
-                        task.save()
-                        
-                        self.logger.info(f"恢复下载任务: {task_id}")
-                        self._notify_status(task, "恢复下载")
+                    self._loop.call_soon_threadsafe(download_info['job'].resume)
+                    
+                    # 更新任务状态
+                    task.status = DownloadTask.STATUS_DOWNLOADING
+                    task.save()
+                    
+                    self.logger.info(f"恢复下载任务: {task_id}")
+                    self._notify_status(task, "恢复下载")
                 return
         
         # 更新任务状态
         if task.status != DownloadTask.STATUS_PAUSED:
             task.downloaded_size = 0
-            
+        
         task.status = DownloadTask.STATUS_DOWNLOADING
         task.save()
         
-        # 创建管道用于进程间通信
-        parent_conn, child_conn = multiprocessing.Pipe()
+        # 确保目标目录存在，下载执行体不再检查
+        self._ensure_dir(os.path.dirname(task.file_path))
         
-        # 创建和启动下载进程
-        stop_event = multiprocessing.Event()
-        pause_event = multiprocessing.Event()
-        
-        process = DownloadProcess(
+        # 交给下载线程的事件循环执行，超出并发数的任务排队等待
+        job = DownloadJob(
             task_id=task.id,
             file_url=task.file_url,
             file_path=task.file_path,
             downloaded_size=task.downloaded_size,
-            pipe_conn=child_conn
+            on_progress=self._on_download_progress,
+            on_status=self._on_download_status
         )
-        process.stop_event = stop_event
-        process.pause_event = pause_event
-        process.start()
-        
-        # 添加到活动下载列表
-        self.active_downloads[task_id] = {
-            'process': process,
-            'pipe_conn': parent_conn,
-            'stop_event': stop_event,
-            'pause_event': pause_event,
-            'start_time': time.time()
-        }
+        # 持有锁直到登记完成，下载即使立即结束，清理也会在登记之后进行
+        with self._active_lock:
+            future = asyncio.run_coroutine_threadsafe(self._run_job(job), self._loop)
+            
+            # 添加到活动下载列表
+            self.active_downloads[task_id] = {
+                'task': task,
+                'job': job,
+                'future': future,
+                'start_time': time.time(),
+                'last_persist_ts': time.monotonic(),
+                'last_persist_bytes': task.downloaded_size
+            }
+            # 下载结束后清理资源
+            future.add_done_callback(lambda done: self._on_download_done(task_id, done))
         
         self.logger.info(f"开始下载任务: {task_id}, URL: {task.file_url}")
         self._notify_status(task, "开始下载")
@@ -502,11 +1000,11 @@ class DownloadService:
         
         Args:
             task_id: 任务ID
-            
+        
         Raises:
             ValueError: 任务不存在或无法暂停
         """
-        task = DownloadTask.get_by_id(task_id)
+        task = self._get_task(task_id)
         if not task:
             raise ValueError(f"任务不存在: {task_id}")
         
@@ -514,14 +1012,11 @@ class DownloadService:
             self.logger.info(f"任务未在下载中，无法暂停: {task_id}")
             return
         
-        # 设置暂停标志
-        if task_id in self.active_downloads:
-            download_info = self.active_downloads[task_id]
-            pause_event = download_info.get('pause_event')
-            
-            if pause_event:
-                pause_event.set()  # 设置暂停标志
-                
+        # 通知下载执行体暂停
+        download_info = self.active_downloads.get(task_id)
+        if download_info is not None:
+            self._loop.call_soon_threadsafe(download_info['job'].pause)
+        
         self.logger.info(f"暂停下载任务: {task_id}")
         self._notify_status(task, "正在暂停下载")
     
@@ -530,11 +1025,11 @@ class DownloadService:
         
         Args:
             task_id: 任务ID
-            
+        
         Raises:
             ValueError: 任务不存在或无法恢复
         """
-        task = DownloadTask.get_by_id(task_id)
+        task = self._get_task(task_id)
         if not task:
             raise ValueError(f"任务不存在: {task_id}")
         
@@ -543,13 +1038,12 @@ class DownloadService:
             return
         
         # 如果任务在活动下载列表中且被暂停，直接恢复
-        if task_id in self.active_downloads and task.status == DownloadTask.STATUS_PAUSED:
-            download_info = self.active_downloads[task_id]
-            process = download_info.get('process')
-            pause_event = download_info.get('pause_event')
+        download_info = self.active_downloads.get(task_id)
+        if download_info is not None and task.status == DownloadTask.STATUS_PAUSED:
+            future = download_info.get('future')
             
-            if process and process.is_alive() and pause_event:
-                pause_event.clear()  # 清除暂停标志
+            if future and not future.done():
+                self._loop.call_soon_threadsafe(download_info['job'].resume)
                 
                 # 更新任务状态
                 task.status = DownloadTask.STATUS_DOWNLOADING
@@ -559,7 +1053,7 @@ class DownloadService:
                 self._notify_status(task, "恢复下载")
                 return
         
-        # 如果任务不在活动下载列表中或进程已结束，重新启动下载
+        # 如果任务不在活动下载列表中或下载已结束，重新启动下载
         task.resume()
         self.logger.info(f"重新启动下载任务: {task_id}")
         self._notify_status(task, "重新启动下载")
@@ -572,21 +1066,18 @@ class DownloadService:
         
         Args:
             task_id: 任务ID
-            
+        
         Raises:
             ValueError: 任务不存在
         """
-        task = DownloadTask.get_by_id(task_id)
+        task = self._get_task(task_id)
         if not task:
             raise ValueError(f"任务不存在: {task_id}")
         
-        # 设置停止标志
-        if task_id in self.active_downloads:
-            download_info = self.active_downloads[task_id]
-            stop_event = download_info.get('stop_event')
-            
-            if stop_event:
-                stop_event.set()  # 设置停止标志
+        download_info = self.active_downloads.get(task_id)
+        if download_info is not None:
+            # 由下载执行体取消并报告最终状态
+            self._loop.call_soon_threadsafe(download_info['job'].cancel)
         else:
             # 如果不在活动下载中，直接更新状态
             task.mark_as_canceled()
@@ -603,7 +1094,7 @@ class DownloadService:
         Raises:
             ValueError: 任务不存在
         """
-        task = DownloadTask.get_by_id(task_id)
+        task = self._get_task(task_id)
         if not task:
             raise ValueError(f"任务不存在: {task_id}")
         
@@ -655,7 +1146,7 @@ class DownloadService:
         Returns:
             Optional[DownloadTask]: 任务对象，不存在则返回None
         """
-        return DownloadTask.get_by_id(task_id)
+        return self._get_task(task_id)
     
     def set_download_directory(self, directory: str) -> None:
         """设置默认下载目录
@@ -666,11 +1157,10 @@ class DownloadService:
         Raises:
             ValueError: 目录无效
         """
-        if not os.path.isdir(directory):
-            try:
-                os.makedirs(directory, exist_ok=True)
-            except:
-                raise ValueError(f"无法创建目录: {directory}")
+        try:
+            self._ensure_dir(directory)
+        except:
+            raise ValueError(f"无法创建目录: {directory}")
         
         self.default_download_dir = directory
         self.logger.info(f"设置默认下载目录: {directory}")
@@ -680,25 +1170,26 @@ class DownloadService:
         
         Args:
             task_id: 任务ID
-            
+        
         Returns:
             float: 下载速度 (bytes/s)
         """
-        if task_id not in self.active_downloads:
+        download_info = self.active_downloads.get(task_id)
+        if download_info is None:
             return 0
-            
-        download_info = self.active_downloads[task_id]
+        
         start_time = download_info.get('start_time', 0)
         
-        task = DownloadTask.get_by_id(task_id)
+        task = self._get_task(task_id)
         if not task or task.status != DownloadTask.STATUS_DOWNLOADING:
             return 0
-            
+        
         elapsed = time.time() - start_time
         if elapsed <= 0:
             return 0
-            
-        return task.downloaded_size / elapsed
+        
+        # 直接读取下载执行体中的实时进度
+        return download_info['job'].downloaded / elapsed
     
     def get_download_status(self, task_id: int) -> Dict[str, Any]:
         """获取下载状态详细信息
@@ -709,9 +1200,14 @@ class DownloadService:
         Returns:
             Dict[str, Any]: 状态信息字典
         """
-        task = DownloadTask.get_by_id(task_id)
+        task = self._get_task(task_id)
         if not task:
             return {}
+        
+        # 下载中的任务使用下载执行体中的实时进度
+        download_info = self.active_downloads.get(task_id)
+        if download_info is not None and task.status == DownloadTask.STATUS_DOWNLOADING:
+            task.downloaded_size = download_info['job'].downloaded
             
         result = {
             "status": task.status,
@@ -726,27 +1222,44 @@ class DownloadService:
             
         return result
         
+    async def _shutdown(self) -> None:
+        """中断所有下载并关闭HTTP会话，在事件循环线程中执行"""
+        with self._active_lock:
+            active = tuple(self.active_downloads.values())
+        
+        tasks = []
+        for download_info in active:
+            job_task = download_info['job']._task
+            if job_task is not None:
+                job_task.cancel()
+                tasks.append(job_task)
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+    
     def cleanup(self):
         """清理所有下载任务和资源"""
-        # 停止所有活动下载
-        for task_id, download_info in list(self.active_downloads.items()):
-            process = download_info.get('process')
-            stop_event = download_info.get('stop_event')
-            
-            if stop_event:
-                stop_event.set()
-                
-            if process and process.is_alive():
-                try:
-                    process.join(0.5)  # 等待进程结束
-                    if process.is_alive():
-                        process.terminate()  # 强制终止
-                except:
-                    pass
-                    
+        if not self._loop.is_running():
+            return
+        
+        # 中断所有下载，已下载的进度会被保存
+        future = asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop)
+        try:
+            future.result(timeout=5)
+        except Exception as e:
+            self.logger.error(f"关闭下载服务失败: {str(e)}")
+        
         # 清空活动下载列表
-        self.active_downloads.clear()
+        with self._active_lock:
+            self.active_downloads.clear()
+        
+        # 停止事件循环线程
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._loop_thread.join(timeout=1)
 
 
 # 创建单例实例
-download_service = DownloadService() 
\ No newline at end of file
+download_service = DownloadService()
@@ -0,0 +1,158 @@
+# 全局样式表
+#
+# 各页面的样式统一在这里定义，启动时由 main.py 一次性安装到 QApplication 上，
+# 避免每个页面/对话框创建时重复解析样式。规则均以页面的 objectName 限定作用范围。
+import re
+
+
+def _minify(qss: str) -> str:
+    """去掉注释和多余空白，缩小样式表体积"""
+    qss = re.sub(r"/\*.*?\*/", "", qss, flags=re.S)
+    return re.sub(r"\s+", " ", qss).strip()
+
+
+# 创建草稿页面
+CREATE_DRAFT_STYLE = """
+    #createDraftPage, #createDraftPage QWidget {
+        background-color: white;
+    }
+
+    #createDraftPage #formCard {
+        background-color: white;
+        border-radius: 10px;
+    }
+
+    #createDraftPage #pageTitle {
+        color: #1d1d1f;
+        margin-bottom: 20px;
+    }
+
+    #createDraftPage #fieldLabel {
+        color: #1d1d1f;
+        font-weight: 500;
+    }
+
+    #createDraftPage QLineEdit {
+        background-color: #f5f5f7;
+        border: none;
+        border-radius: 6px;
+        padding: 0 10px;
+        font-size: 14px;
+        color: #1d1d1f;
+    }
+
+    #createDraftPage QLineEdit:focus {
+        background-color: white;
+        border: 2px solid #0066cc;
+    }
+
+    #createDraftPage QLineEdit:disabled {
+        background-color: #f5f5f7;
+        color: #86868b;
+    }
+
+    #createDraftPage QPushButton#browseButton,
+    #createDraftPage QPushButton#generateButton {
+        border: none;
+        border-radius: 6px;
+    }
+
+    #createDraftPage QPushButton#browseButton {
+        background-color: #f5f5f7;
+        color: #1d1d1f;
+        padding: 0 15px;
+    }
+
+    #createDraftPage QPushButton#browseButton:hover {
+        background-color: #e5e5e5;
+    }
+
+    #createDraftPage QPushButton#generateButton {
+        background-color: #0066cc;
+        color: white;
+        padding: 0 20px;
+    }
+
+    #createDraftPage QPushButton#generateButton:hover {
+        background-color: #0055b3;
+    }
+
+    #createDraftPage QPushButton#generateButton:pressed {
+        background-color: #004c99;
+    }
+"""
+
+# 创建草稿页面的消息框
+MESSAGE_BOX_STYLE = """
+    QMessageBox#createDraftMessage {
+        background-color: white;
+    }
+    QMessageBox#createDraftMessage QLabel {
+        color: #1d1d1f;
+        font-size: 14px;
+        font-family: 'SF Pro Text';
+    }
+    QMessageBox#createDraftMessage QPushButton {
+        background-color: #0066cc;
+        color: white;
+        border: none;
+        border-radius: 6px;
+        padding: 8px 16px;
+        font-family: 'SF Pro Text';
+        font-size: 13px;
+        min-width: 80px;
+    }
+    QMessageBox#createDraftMessage QPushButton:hover {
+        background-color: #0055b3;
+    }
+"""
+
+# 草稿箱搜索区域
+SEARCH_FRAME_STYLE = """
+    QFrame#searchFrame {
+        background-color: white;
+        border: 1px solid #e0e0e0;
+        border-radius: 4px;
+    }
+    QFrame#searchFrame QLabel {
+        min-width: 60px;
+    }
+    QFrame#searchFrame QLineEdit {
+        padding: 5px;
+        border: 1px solid #e0e0e0;
+        border-radius: 4px;
+        margin-right: 10px;
+    }
+    QFrame#searchFrame QPushButton {
+        padding: 5px 15px;
+        border-radius: 4px;
+        color: white;
+    }
+    QFrame#searchFrame QPushButton#searchButton {
+        background-color: #1976D2;
+    }
+    QFrame#searchFrame QPushButton#resetButton {
+        background-color: #757575;
+    }
+"""
+
+# 草稿箱页面
+DRAFT_BOX_STYLE = """
+    #draftBoxPage QTableView {
+        background-color: white;
+        border: 1px solid #e0e0e0;
+        border-radius: 4px;
+    }
+    #draftBoxPage QTableView::item {
+        padding: 5px;
+    }
+    #draftBoxPage QHeaderView::section {
+        background-color: #f5f5f5;
+        padding: 5px;
+        border: none;
+        border-right: 1px solid #e0e0e0;
+        border-bottom: 1px solid #e0e0e0;
+    }
+"""
+
+STYLE = _minify(CREATE_DRAFT_STYLE + MESSAGE_BOX_STYLE + SEARCH_FRAME_STYLE + DRAFT_BOX_STYLE)
@@ -1,10 +1,12 @@
 import os
 import sqlite3
 import threading
-from typing import Optional, Dict, Any, List, Tuple, Union
+from typing import Optional, Dict, Any, List, Tuple, Union, Callable, Hashable, Sequence
 from datetime import datetime
 import json
 import logging
+import time
+from contextlib import contextmanager, nullcontext
 
 # 获取logger
 from .logger import get_logger
@@ -13,64 +15,179 @@ db_logger = get_logger("database")
 # 数据库文件路径
 DB_PATH = os.path.join(os.path.expanduser("~"), ".jy_draft", "database.sqlite")
 
+# 单条语句最多可绑定的参数数量（SQLite默认限制）
+MAX_VARIABLES = 999
+
+# 长连接定期执行 PRAGMA optimize 的间隔（秒）
+OPTIMIZE_INTERVAL = 3600
+
+
+# 模块导入时创建的唯一实例，导入锁保证只创建一次
+_DB_INSTANCE: Optional["Database"] = None
+
 
 class Database:
     """SQLite数据库管理类"""
     
-    _instance = None
-    _lock = threading.Lock()
-    
     def __new__(cls):
-        """单例模式实现"""
-        with cls._lock:
-            if cls._instance is None:
-                cls._instance = super(Database, cls).__new__(cls)
-                cls._instance._initialized = False
-            return cls._instance
+        """单例模式实现，实例创建后直接返回，不需要加锁"""
+        if _DB_INSTANCE is not None:
+            return _DB_INSTANCE
+        return super().__new__(cls)
     
     def __init__(self):
         """初始化数据库连接"""
-        if self._initialized:
+        if self is _DB_INSTANCE:
             return
-            
-        self._initialized = True
+        
         self.logger = db_logger
         
         # 确保数据库目录存在
         os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
         
-        # 创建数据库连接
+        # 共享连接只用于建表和维护，读写使用各线程自己的连接
         self.conn = None
+        # 每个线程的连接和显式事务状态
+        self._tls = threading.local()
+        # 已打开的全部连接，关闭时统一释放
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        # 数据库未能切换到WAL模式时，多个连接的语句需要串行执行
+        self._wal = True
+        self._write_lock = threading.RLock()
+        # 定期维护的定时器
+        self._maintenance_timer: Optional[threading.Timer] = None
+        # 各表已有的列名，供 add_column_if_not_exists 检查
+        self._col_cache: Dict[str, set] = {}
         self.connect()
         
         # 初始化数据库表
         self.init_database()
     
+    def _open_connection(self) -> sqlite3.Connection:
+        """打开一个新连接并设置连接级别的参数
+        
+        Returns:
+            sqlite3.Connection: 数据库连接
+        """
+        # 自动提交模式，需要批量写入时显式开启事务；增大预编译语句缓存
+        # 允许在其他线程中关闭连接
+        conn = sqlite3.connect(
+            DB_PATH,
+            check_same_thread=False,
+            isolation_level=None,
+            cached_statements=256
+        )
+        # 启用外键约束
+        conn.execute("PRAGMA foreign_keys = ON")
+        # NORMAL同步级别减少fsync次数
+        conn.execute("PRAGMA synchronous = NORMAL")
+        # 约20MB页缓存，临时表放在内存中，读取通过内存映射减少拷贝
+        conn.execute("PRAGMA cache_size = -20000")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        conn.execute("PRAGMA mmap_size = 268435456")
+        # 配置返回行为字典
+        conn.row_factory = sqlite3.Row
+        with self._connections_lock:
+            self._connections.append(conn)
+        return conn
+    
     def connect(self) -> None:
-        """建立数据库连接"""
+        """建立共享数据库连接"""
         try:
-            self.conn = sqlite3.connect(DB_PATH, check_same_thread=False)
-            # 启用外键约束
-            self.conn.execute("PRAGMA foreign_keys = ON")
-            # 配置返回行为字典
-            self.conn.row_factory = sqlite3.Row
+            self.conn = self._open_connection()
+            # WAL模式下读写互不阻塞，各线程的连接可以同时读取；该设置保存在数据库文件中
+            journal_mode = self.conn.execute("PRAGMA journal_mode = WAL").fetchone()[0]
+            self._wal = str(journal_mode).lower() == 'wal'
+            # 长连接打开时先做一次轻量的统计信息更新
+            self.conn.execute("PRAGMA optimize = 0x10002")
+            self._schedule_maintenance()
             self.logger.info(f"数据库连接成功: {DB_PATH}")
         except Exception as e:
             self.logger.error(f"数据库连接失败: {str(e)}")
             raise
     
+    def _schedule_maintenance(self) -> None:
+        """安排下一次定期维护"""
+        if self._maintenance_timer:
+            self._maintenance_timer.cancel()
+        timer = threading.Timer(OPTIMIZE_INTERVAL, self._periodic_maintenance)
+        timer.daemon = True
+        self._maintenance_timer = timer
+        timer.start()
+    
+    def _periodic_maintenance(self) -> None:
+        """定时器线程中执行维护并安排下一次"""
+        if not self.conn:
+            return
+        try:
+            self.maintenance()
+        except Exception:
+            # 维护失败不影响正常使用，错误已记录
+            pass
+        self._schedule_maintenance()
+    
+    def maintenance(self) -> None:
+        """执行 PRAGMA optimize，按需更新查询规划器使用的统计信息"""
+        if not self.conn:
+            return
+        try:
+            with self._write_guard():
+                self.conn.execute("PRAGMA optimize")
+        except Exception as e:
+            self.logger.error(f"数据库维护失败: {str(e)}")
+            raise
+    
     def close(self) -> None:
-        """关闭数据库连接"""
+        """关闭全部数据库连接"""
+        if self._maintenance_timer:
+            self._maintenance_timer.cancel()
+            self._maintenance_timer = None
+        if self.conn:
+            # 关闭前更新统计信息，下次打开时查询计划更准确
+            try:
+                self.maintenance()
+            except Exception:
+                pass
+        
+        with self._connections_lock:
+            connections = self._connections
+            self._connections = []
+        for conn in connections:
+            conn.close()
+        # 丢弃各线程保存的旧连接，之后使用时重新打开
+        self._tls = threading.local()
+        
         if self.conn:
-            self.conn.close()
             self.conn = None
             self.logger.info("数据库连接已关闭")
     
     def get_connection(self) -> sqlite3.Connection:
-        """获取数据库连接"""
-        if not self.conn:
-            self.connect()
-        return self.conn
+        """获取当前线程的数据库连接，首次使用时打开"""
+        conn = getattr(self._tls, 'conn', None)
+        if conn is None:
+            if not self.conn:
+                self.connect()
+            conn = self._open_connection()
+            self._tls.conn = conn
+        return conn
+    
+    @property
+    def _in_transaction(self) -> bool:
+        """当前线程是否处于 transaction() 开启的显式事务中"""
+        return getattr(self._tls, 'in_transaction', False)
+    
+    @_in_transaction.setter
+    def _in_transaction(self, value: bool) -> None:
+        self._tls.in_transaction = value
+    
+    def _write_guard(self):
+        """非WAL模式下串行执行语句，WAL模式下不加锁
+        
+        Returns:
+            上下文管理器
+        """
+        return nullcontext() if self._wal else self._write_lock
     
     def execute(self, query: str, params: Tuple = ()) -> sqlite3.Cursor:
         """执行SQL语句
@@ -82,17 +199,53 @@ class Database:
         Returns:
             sqlite3.Cursor: 游标对象
         """
+        conn = self.get_connection()
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            cursor.execute(query, params)
-            conn.commit()
+            with self._write_guard():
+                cursor = conn.cursor()
+                cursor.execute(query, params)
+                if not self._in_transaction:
+                    conn.commit()
             return cursor
         except Exception as e:
             self.logger.error(f"SQL执行错误: {query}, 参数: {params}, 错误: {str(e)}")
-            conn.rollback()
+            if not self._in_transaction:
+                conn.rollback()
             raise
     
+    @contextmanager
+    def transaction(self):
+        """显式事务，块内的所有写操作一次提交
+        
+        事务属于当前线程的连接，其他线程的语句不会并入该事务。
+        
+        用法:
+            with db.transaction():
+                db.execute(...)
+                db.execute(...)
+        
+        Yields:
+            sqlite3.Connection: 数据库连接
+        """
+        if self._in_transaction:
+            # 已在事务中，直接并入外层事务
+            yield self.get_connection()
+            return
+            
+        conn = self.get_connection()
+        with self._write_guard():
+            conn.execute("BEGIN")
+            self._in_transaction = True
+            try:
+                yield conn
+                conn.commit()
+            except BaseException:
+                # 包括 KeyboardInterrupt、GeneratorExit，避免事务一直未结束
+                conn.rollback()
+                raise
+            finally:
+                self._in_transaction = False
+    
     def executemany(self, query: str, params_list: List[Tuple]) -> sqlite3.Cursor:
         """批量执行SQL语句
         
@@ -103,17 +256,58 @@ class Database:
         Returns:
             sqlite3.Cursor: 游标对象
         """
+        conn = self.get_connection()
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            cursor.executemany(query, params_list)
-            conn.commit()
+            with self._write_guard():
+                cursor = conn.cursor()
+                if self._in_transaction:
+                    cursor.executemany(query, params_list)
+                    return cursor
+                # 自动提交模式下需显式开启事务，所有语句一次提交
+                cursor.execute("BEGIN")
+                cursor.executemany(query, params_list)
+                conn.commit()
             return cursor
         except Exception as e:
             self.logger.error(f"批量SQL执行错误: {query}, 错误: {str(e)}")
-            conn.rollback()
+            if not self._in_transaction:
+                conn.rollback()
             raise
     
+    def insert_batch(self, table: str, columns: Sequence[str], rows: List[Tuple],
+                     chunk: int = 500) -> int:
+        """批量插入记录，每组多行合并为一条多值 INSERT 语句，全部在同一事务中提交
+        
+        Args:
+            table: 表名
+            columns: 列名
+            rows: 与列顺序一致的值元组列表
+            chunk: 每条语句包含的最大行数
+            
+        Returns:
+            int: 插入的记录数
+        """
+        if not rows:
+            return 0
+        
+        # 每条语句的参数数量不能超过 SQLite 的限制
+        chunk = max(1, min(chunk, MAX_VARIABLES // len(columns)))
+        column_list = ", ".join(columns)
+        row_placeholders = f"({', '.join('?' * len(columns))})"
+        
+        inserted = 0
+        with self.transaction():
+            for start in range(0, len(rows), chunk):
+                group = rows[start:start + chunk]
+                # 满组的语句文本相同，可以命中连接的语句缓存
+                query = (
+                    f"INSERT INTO {table} ({column_list}) VALUES "
+                    f"{', '.join([row_placeholders] * len(group))}"
+                )
+                params = tuple(value for row in group for value in row)
+                inserted += self.execute(query, params).rowcount
+        return inserted
+    
     def query_one(self, query: str, params: Tuple = ()) -> Optional[Dict[str, Any]]:
         """查询单条记录
         
@@ -152,6 +346,25 @@ class Database:
             self.logger.error(f"查询错误: {query}, 参数: {params}, 错误: {str(e)}")
             raise
     
+    def query_rows(self, query: str, params: Tuple = ()) -> List[sqlite3.Row]:
+        """查询多条记录，直接返回行对象
+        
+        行对象可按列顺序解包，省去逐行转换为字典的开销，适合大结果集。
+        
+        Args:
+            query: SQL查询语句
+            params: 查询参数
+            
+        Returns:
+            List[sqlite3.Row]: 查询结果行列表
+        """
+        try:
+            cursor = self.execute(query, params)
+            return cursor.fetchall()
+        except Exception as e:
+            self.logger.error(f"查询错误: {query}, 参数: {params}, 错误: {str(e)}")
+            raise
+    
     def table_exists(self, table_name: str) -> bool:
         """检查表是否存在
         
@@ -169,10 +382,11 @@ class Database:
         return result is not None
     
     def init_database(self) -> None:
-        """初始化数据库表结构"""
+        """在共享连接上初始化数据库表结构，只在创建实例时执行一次"""
+        conn = self.conn
         try:
             # 创建用户表
-            self.execute("""
+            conn.execute("""
                 CREATE TABLE IF NOT EXISTS users (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     phone TEXT UNIQUE,
@@ -186,7 +400,7 @@ class Database:
             """)
             
             # 创建下载任务表
-            self.execute("""
+            conn.execute("""
                 CREATE TABLE IF NOT EXISTS download_tasks (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     user_id INTEGER,
@@ -204,11 +418,39 @@ class Database:
                 )
             """)
             
+            # 创建下载任务索引
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_dt_url_user
+                ON download_tasks(file_url, user_id)
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_dt_user_id_desc
+                ON download_tasks(user_id, id DESC)
+            """)
+            # 覆盖 count_by_status / get_by_status 的状态查询
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_dt_status_user
+                ON download_tasks(status, user_id)
+            """)
+            # 活动任务查询由 idx_dt_status_user 按状态查找，规划器不会选用旧的部分索引
+            conn.execute("DROP INDEX IF EXISTS idx_dt_active")
+            
             self.logger.info("数据库表初始化完成")
         except Exception as e:
             self.logger.error(f"数据库表初始化失败: {str(e)}")
             raise
     
+    def invalidate_schema_cache(self, table: Optional[str] = None) -> None:
+        """表结构在 add_column_if_not_exists 之外被修改后，清除缓存的列名
+        
+        Args:
+            table: 表名，为None时清除全部
+        """
+        if table is None:
+            self._col_cache.clear()
+        else:
+            self._col_cache.pop(table, None)
+    
     def add_column_if_not_exists(self, table: str, column: str, definition: str) -> None:
         """添加列如果不存在
         
@@ -218,20 +460,104 @@ class Database:
             definition: 列定义
         """
         try:
-            # 检查列是否存在
-            query = f"PRAGMA table_info({table})"
-            columns = self.query_all(query)
-            column_exists = any(col['name'] == column for col in columns)
+            # 检查列是否存在，表的列名只查询一次
+            columns = self._col_cache.get(table)
+            if columns is None:
+                rows = self.query_rows(f"PRAGMA table_info({table})")
+                columns = self._col_cache[table] = {row['name'] for row in rows}
             
-            if not column_exists:
+            if column not in columns:
                 # 添加列
                 alter_query = f"ALTER TABLE {table} ADD COLUMN {column} {definition}"
                 self.execute(alter_query)
+                columns.add(column)
                 self.logger.info(f"表 {table} 添加列 {column} 成功")
         except Exception as e:
             self.logger.error(f"添加列失败: {str(e)}")
             raise
 
 
+class QueryCache:
+    """短时查询结果缓存
+    
+    缓存单条查询的结果若干秒；多个线程同时查询同一键时只执行一次查询，
+    其余线程等待并共用结果。写操作后应调用 invalidate() 清除缓存。
+    """
+    
+    def __init__(self, ttl: float = 1.0, maxsize: int = 4096):
+        """初始化查询缓存
+        
+        Args:
+            ttl: 缓存有效时间（秒）
+            maxsize: 最大缓存条目数
+        """
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: Dict[Hashable, Tuple[float, Any]] = {}
+        self._inflight: Dict[Hashable, threading.Event] = {}
+        # 每次失效递增，避免把失效前查到的旧结果写回缓存
+        self._generation = 0
+        self._lock = threading.Lock()
+    
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """获取缓存结果，不存在或已过期时调用 loader 查询
+        
+        Args:
+            key: 缓存键
+            loader: 查询函数，返回None的结果不缓存
+            
+        Returns:
+            Any: 查询结果
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry and time.monotonic() - entry[0] < self.ttl:
+                return entry[1]
+            event = self._inflight.get(key)
+            owner = event is None
+            if owner:
+                event = threading.Event()
+                self._inflight[key] = event
+            generation = self._generation
+        
+        if not owner:
+            # 等待进行中的同一查询完成后直接使用其结果
+            event.wait()
+            with self._lock:
+                entry = self._data.get(key)
+            if entry:
+                return entry[1]
+            return loader()
+        
+        value = None
+        try:
+            value = loader()
+            return value
+        finally:
+            with self._lock:
+                if value is not None and generation == self._generation:
+                    if len(self._data) >= self.maxsize:
+                        # 淘汰最早写入的条目
+                        self._data.pop(next(iter(self._data)))
+                    self._data[key] = (time.monotonic(), value)
+                del self._inflight[key]
+            event.set()
+    
+    def invalidate(self) -> None:
+        """清除全部缓存"""
+        with self._lock:
+            self._data.clear()
+            self._generation += 1
+
+
 # 创建单例实例
-db = Database() 
\ No newline at end of file
+db = _DB_INSTANCE = Database()
+
+
+def get_db() -> Database:
+    """获取数据库单例
+    
+    Returns:
+        Database: 数据库实例
+    """
+    return _DB_INSTANCE 
\ No newline at end of file
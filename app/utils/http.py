@@ -1,13 +1,52 @@
-from typing import Optional, Dict, Any, Union
-import requests
-from requests.adapters import HTTPAdapter
-from requests.packages.urllib3.util.retry import Retry
-from ..config import settings
+from typing import Optional, Dict, Any, Union, List, Tuple, Mapping
+from types import MappingProxyType
+import asyncio
+import json
+import logging
+import aiohttp
+from ..config import get_settings
 from .logger import api_logger
 
+# orjson 编解码速度更快，未安装时使用标准库
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """序列化为JSON字节串
+    
+    Args:
+        obj: 要序列化的对象
+        
+    Returns:
+        bytes: UTF-8编码的JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _json_loads(data: bytes) -> Any:
+    """解析JSON字节串
+    
+    Args:
+        data: JSON内容
+        
+    Returns:
+        Any: 解析结果
+        
+    Raises:
+        ValueError: 内容不是合法的JSON
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
 
 class HTTPClient:
-    """HTTP客户端工具类
+    """异步HTTP客户端工具类
     
     提供统一的HTTP请求处理，包括：
     - 自动重试机制
@@ -16,6 +55,23 @@ class HTTPClient:
     - 日志记录
     """
 
+    # 需要重试的响应状态码
+    RETRY_STATUS = frozenset({500, 502, 503, 504})
+    # 幂等请求需要重试的网络异常，包括请求发出后的读取失败和超时
+    RETRY_ERRORS = (aiohttp.ClientConnectionError, asyncio.TimeoutError)
+    # 非幂等请求只在连接未建立、请求未到达服务器时重试
+    CONNECT_ERRORS = (aiohttp.ClientConnectorError,)
+    # 可以安全重复发送的请求方法，与 urllib3 Retry 的默认值一致
+    IDEMPOTENT_METHODS = frozenset({'HEAD', 'GET', 'PUT', 'DELETE', 'OPTIONS', 'TRACE'})
+    # 重试退避系数（秒）
+    RETRY_BACKOFF = 0.5
+    # 连接池大小
+    POOL_SIZE = 64
+    # 空闲连接保留时间（秒），期间的请求复用已完成TLS握手的连接
+    KEEPALIVE_TIMEOUT = 120
+    # batch() 同时进行的最大请求数
+    BATCH_CONCURRENCY = 8
+
     def __init__(self, base_url: str = "", timeout: int = None):
         """初始化HTTP客户端
         
@@ -24,30 +80,52 @@ class HTTPClient:
             timeout: 请求超时时间（秒）
         """
         self.base_url = base_url.rstrip('/')
-        self.timeout = timeout or settings.API_TIMEOUT
-        self.session = self._create_session()
+        self.timeout = timeout or get_settings().API_TIMEOUT
+        self.retry_count = get_settings().API_RETRY_COUNT
+        # 基础请求头只构建一次，没有额外请求头时直接使用
+        base_headers = {'Content-Type': 'application/json'}
+        if get_settings().API_TOKEN:
+            base_headers['Authorization'] = f'Bearer {get_settings().API_TOKEN}'
+        self._base_headers: Mapping[str, str] = MappingProxyType(base_headers)
+        # 会话需要在事件循环中创建，首次请求时初始化
+        self.session: Optional[aiohttp.ClientSession] = None
+        # 创建会话的事件循环，会话只能在该循环中关闭
+        self.session_loop: Optional[asyncio.AbstractEventLoop] = None
 
-    def _create_session(self) -> requests.Session:
-        """创建配置好的requests会话
+    def _create_session(self) -> aiohttp.ClientSession:
+        """创建配置好的aiohttp会话
         
         Returns:
-            requests.Session: 配置好的会话对象
+            aiohttp.ClientSession: 配置好的会话对象
         """
-        session = requests.Session()
-        
-        # 配置重试策略
-        retry_strategy = Retry(
-            total=settings.API_RETRY_COUNT,
-            backoff_factor=0.5,
-            status_forcelist=[500, 502, 503, 504]
+        # 连接池允许并发请求各自使用连接，空闲连接保留一段时间供后续请求复用
+        connector = aiohttp.TCPConnector(
+            limit=self.POOL_SIZE,
+            ttl_dns_cache=300,
+            keepalive_timeout=self.KEEPALIVE_TIMEOUT
         )
+        return aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout)
+        )
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """获取会话，未创建或已关闭时重新创建
         
-        # 配置适配器
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        session.mount("http://", adapter)
-        session.mount("https://", adapter)
-        
-        return session
+        Returns:
+            aiohttp.ClientSession: 会话对象
+        """
+        if self.session is None or self.session.closed:
+            self.session = self._create_session()
+            self.session_loop = asyncio.get_running_loop()
+        return self.session
+
+    async def close(self) -> None:
+        """关闭会话，释放连接池"""
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
+        self.session_loop = None
 
     def _build_url(self, endpoint: str) -> str:
         """构建完整的URL
@@ -61,27 +139,21 @@ class HTTPClient:
         endpoint = endpoint.lstrip('/')
         return f"{self.base_url}/{endpoint}" if self.base_url else endpoint
 
-    def _get_headers(self, additional_headers: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    def _get_headers(self, additional_headers: Optional[Dict[str, str]] = None) -> Mapping[str, str]:
         """获取请求头
         
         Args:
             additional_headers: 额外的请求头
             
         Returns:
-            Dict[str, str]: 合并后的请求头
+            Mapping[str, str]: 合并后的请求头，没有额外请求头时为只读的基础请求头
         """
-        headers = {
-            'Content-Type': 'application/json'
-        }
+        if not additional_headers:
+            return self._base_headers
         
-        # 添加API Token（如果配置了的话）
-        if settings.API_TOKEN:
-            headers['Authorization'] = f'Bearer {settings.API_TOKEN}'
-            
         # 合并额外的请求头
-        if additional_headers:
-            headers.update(additional_headers)
-            
+        headers = dict(self._base_headers)
+        headers.update(additional_headers)
         return headers
 
     def _log_request(self, method: str, url: str, **kwargs):
@@ -92,44 +164,53 @@ class HTTPClient:
             url: 请求URL
             **kwargs: 请求参数
         """
-        api_logger.info(f"API Request: {method} {url}")
+        api_logger.info("API Request: %s %s", method, url)
+        # 未开启DEBUG日志时不格式化参数和请求体
+        if not api_logger.isEnabledFor(logging.DEBUG):
+            return
         if kwargs.get('params'):
-            api_logger.debug(f"Query Params: {kwargs['params']}")
+            api_logger.debug("Query Params: %s", kwargs['params'])
         if kwargs.get('json'):
-            api_logger.debug(f"Request Body: {kwargs['json']}")
+            api_logger.debug("Request Body: %s", kwargs['json'])
 
-    def _log_response(self, response: requests.Response):
+    def _log_response(self, response: aiohttp.ClientResponse, body: bytes):
         """记录响应日志
         
         Args:
             response: 响应对象
+            body: 响应内容
         """
-        api_logger.info(f"API Response: {response.status_code} {response.reason}")
-        api_logger.debug(f"Response Body: {response.text}")
+        api_logger.info("API Response: %s %s", response.status, response.reason)
+        # 未开启DEBUG日志时不解码响应内容
+        if api_logger.isEnabledFor(logging.DEBUG):
+            api_logger.debug("Response Body: %s", body.decode('utf-8', 'replace'))
 
-    def _handle_response(self, response: requests.Response) -> Dict[str, Any]:
+    def _handle_response(self, response: aiohttp.ClientResponse, body: bytes) -> Dict[str, Any]:
         """处理响应
         
         Args:
             response: 响应对象
+            body: 响应内容
             
         Returns:
             Dict[str, Any]: 响应数据
             
         Raises:
-            requests.exceptions.HTTPError: 当响应状态码不是2xx时
+            aiohttp.ClientResponseError: 当响应状态码不是2xx时
         """
         try:
             response.raise_for_status()
-            return response.json()
-        except requests.exceptions.JSONDecodeError:
-            api_logger.error("Failed to decode JSON response")
-            return {'text': response.text}
-        except requests.exceptions.HTTPError as e:
-            api_logger.error(f"HTTP Error: {str(e)}")
+        except aiohttp.ClientResponseError as e:
+            api_logger.error("HTTP Error: %s", e)
             raise
+        try:
+            # 直接解析字节内容，省去先解码为字符串
+            return _json_loads(body)
+        except ValueError:
+            api_logger.error("Failed to decode JSON response")
+            return {'text': body.decode(response.get_encoding(), 'replace')}
 
-    def request(
+    async def request(
         self,
         method: str,
         endpoint: str,
@@ -154,39 +235,78 @@ class HTTPClient:
         url = self._build_url(endpoint)
         headers = self._get_headers(headers)
         
-        kwargs.update({
-            'timeout': self.timeout,
-            'headers': headers,
-            'params': params,
-            'json': data
-        })
+        self._log_request(method, url, params=params, json=data)
         
-        self._log_request(method, url, **kwargs)
+        # 请求体预先序列化为字节，Content-Type 已在请求头中设置
+        body = _json_dumps(data) if data is not None else None
         
+        # POST/PATCH 可能已被服务器处理，重试会重复提交
+        idempotent = method.upper() in self.IDEMPOTENT_METHODS
+        retry_errors = self.RETRY_ERRORS if idempotent else self.CONNECT_ERRORS
+        
+        session = self._get_session()
         try:
-            response = self.session.request(method, url, **kwargs)
-            self._log_response(response)
-            return self._handle_response(response)
+            for attempt in range(self.retry_count + 1):
+                try:
+                    async with session.request(
+                        method, url, headers=headers, params=params, data=body, **kwargs
+                    ) as response:
+                        content = await response.read()
+                except retry_errors as e:
+                    # 网络异常按退避时间重试
+                    if attempt >= self.retry_count:
+                        raise
+                    api_logger.warning("API Request error: %r, retrying (%d/%d)", e, attempt + 1, self.retry_count)
+                    await asyncio.sleep(self.RETRY_BACKOFF * (2 ** attempt))
+                    continue
+                if idempotent and response.status in self.RETRY_STATUS and attempt < self.retry_count:
+                    api_logger.warning("API Response: %s, retrying (%d/%d)", response.status, attempt + 1, self.retry_count)
+                    await asyncio.sleep(self.RETRY_BACKOFF * (2 ** attempt))
+                    continue
+                self._log_response(response, content)
+                return self._handle_response(response, content)
         except Exception as e:
-            api_logger.error(f"Request failed: {str(e)}")
+            api_logger.error("Request failed: %s", e)
             raise
 
-    def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None, **kwargs) -> Dict[str, Any]:
+    async def batch(self, reqs: List[Tuple[str, str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """并发发送多个请求，总耗时接近其中最慢的一个
+        
+        Args:
+            reqs: (请求方法, API端点, request() 的其他参数) 列表
+            
+        Returns:
+            List[Dict[str, Any]]: 与请求顺序一致的响应数据
+            
+        Raises:
+            Exception: 任一请求失败时抛出其异常
+        """
+        semaphore = asyncio.Semaphore(self.BATCH_CONCURRENCY)
+        
+        async def send(method: str, endpoint: str, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.request(method, endpoint, **kwargs)
+        
+        return list(await asyncio.gather(
+            *(send(method, endpoint, kwargs) for method, endpoint, kwargs in reqs)
+        ))
+
+    async def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None, **kwargs) -> Dict[str, Any]:
         """发送GET请求"""
-        return self.request('GET', endpoint, params=params, **kwargs)
+        return await self.request('GET', endpoint, params=params, **kwargs)
 
-    def post(self, endpoint: str, data: Optional[Dict[str, Any]] = None, **kwargs) -> Dict[str, Any]:
+    async def post(self, endpoint: str, data: Optional[Dict[str, Any]] = None, **kwargs) -> Dict[str, Any]:
         """发送POST请求"""
-        return self.request('POST', endpoint, data=data, **kwargs)
+        return await self.request('POST', endpoint, data=data, **kwargs)
 
-    def put(self, endpoint: str, data: Optional[Dict[str, Any]] = None, **kwargs) -> Dict[str, Any]:
+    async def put(self, endpoint: str, data: Optional[Dict[str, Any]] = None, **kwargs) -> Dict[str, Any]:
         """发送PUT请求"""
-        return self.request('PUT', endpoint, data=data, **kwargs)
+        return await self.request('PUT', endpoint, data=data, **kwargs)
 
-    def delete(self, endpoint: str, **kwargs) -> Dict[str, Any]:
+    async def delete(self, endpoint: str, **kwargs) -> Dict[str, Any]:
         """发送DELETE请求"""
-        return self.request('DELETE', endpoint, **kwargs)
+        return await self.request('DELETE', endpoint, **kwargs)
 
-    def patch(self, endpoint: str, data: Optional[Dict[str, Any]] = None, **kwargs) -> Dict[str, Any]:
+    async def patch(self, endpoint: str, data: Optional[Dict[str, Any]] = None, **kwargs) -> Dict[str, Any]:
         """发送PATCH请求"""
-        return self.request('PATCH', endpoint, data=data, **kwargs) 
\ No newline at end of file
+        return await self.request('PATCH', endpoint, data=data, **kwargs) 
\ No newline at end of file
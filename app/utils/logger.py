@@ -1,27 +1,103 @@
 import os
 import logging
 import sys
-from logging.handlers import RotatingFileHandler
+import threading
+import queue
+import atexit
+import json
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from pathlib import Path
 
-from app.config import settings
+from app.config import get_settings
+
+
+# 创建日志记录器时使用的锁，避免多个线程重复添加处理器
+_setup_lock = threading.Lock()
+# 已配置的日志记录器：(名称, 日期) -> logging.Logger
+_configured_loggers: Dict[tuple, logging.Logger] = {}
+
+
+class _DispatchHandler(logging.Handler):
+    """在后台线程中按记录器名称把日志交给对应的控制台和文件处理器"""
+
+    def __init__(self):
+        super().__init__()
+        # 记录器名称 -> 实际输出的处理器
+        self.targets: Dict[str, List[logging.Handler]] = {}
+
+    def handle(self, record):
+        for handler in self.targets.get(record.name, ()):
+            if record.levelno >= handler.level:
+                handler.handle(record)
+        return True
+
+    def close(self):
+        for handlers in self.targets.values():
+            for handler in handlers:
+                handler.close()
+        super().close()
+
+
+# 各记录器只把日志放入队列，由后台线程写入控制台和文件，调用方不等待磁盘I/O
+_log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+_dispatch_handler = _DispatchHandler()
+_log_listener: Optional[QueueListener] = None
+
+
+def _ensure_listener() -> None:
+    """首次配置记录器时启动后台写日志线程，退出时写完剩余日志"""
+    global _log_listener
+    if _log_listener is None:
+        _log_listener = QueueListener(_log_queue, _dispatch_handler)
+        _log_listener.start()
+        atexit.register(_log_listener.stop)
+
+
+class ExtraDataFilter(logging.Filter):
+    """为没有 extra_data 的日志记录补上空值"""
+
+    def filter(self, record):
+        if not hasattr(record, "extra_data"):
+            record.extra_data = ""
+        return True
+
+
+class _LazyExtra:
+    """附加数据只在日志真正输出、格式化时才转换为字符串"""
+
+    __slots__ = ("data",)
+
+    def __init__(self, data: Dict[str, Any]):
+        self.data = data
+
+    def __str__(self):
+        return json.dumps(self.data, ensure_ascii=False, default=str)
 
 
 class Logger:
     def __init__(self, app_name: str = None):
         self.logger = None
-        self.app_name = app_name or settings.APP_NAME
+        self.app_name = app_name or get_settings().APP_NAME
         self.setup_logger()
 
     def setup_logger(self):
-        # 获取当前日期
-        now = datetime.now()
-        year_month = now.strftime("%Y/%m")
-        day = now.strftime("%d")
+        # 同一天内同名的日志记录器只配置一次
+        day_key = datetime.now().strftime("%Y/%m/%d")
+        key = (self.app_name, day_key)
+        with _setup_lock:
+            logger = _configured_loggers.get(key)
+            if logger is None:
+                logger = self._build_logger(day_key)
+                _configured_loggers[key] = logger
+        self.logger = logger
+
+    def _build_logger(self, day_key: str) -> logging.Logger:
+        settings = get_settings()
 
         # 创建日志目录
+        year_month, day = day_key.rsplit("/", 1)
         log_dir = os.path.join(settings.LOG_DIR, year_month)
         os.makedirs(log_dir, exist_ok=True)
 
@@ -29,15 +105,17 @@ class Logger:
         log_file = os.path.join(log_dir, f"{settings.LOG_FILE_PREFIX}_{day}.log")
 
         # 创建logger
-        self.logger = logging.getLogger(self.app_name)
+        logger = logging.getLogger(self.app_name)
         
         # 设置日志级别
         log_level = getattr(logging, settings.LOG_LEVEL.upper())
-        self.logger.setLevel(log_level)
+        logger.setLevel(log_level)
 
-        # 清除现有的处理器
-        if self.logger.handlers:
-            self.logger.handlers.clear()
+        # 清除现有的处理器（前一天的日志文件）
+        if logger.handlers:
+            for handler in logger.handlers:
+                handler.close()
+            logger.handlers.clear()
 
         # 创建文件处理器 (使用RotatingFileHandler代替FileHandler)
         file_handler = RotatingFileHandler(
@@ -52,14 +130,9 @@ class Logger:
         console_handler = logging.StreamHandler()
         console_handler.setLevel(log_level)
 
-        # 添加自定义过滤器来处理extra_data
-        class ExtraDataFilter(logging.Filter):
-            def filter(self, record):
-                if not hasattr(record, "extra_data"):
-                    record.extra_data = ""
-                return True
-
-        self.logger.addFilter(ExtraDataFilter())
+        # 添加自定义过滤器来处理extra_data，只添加一次
+        if not any(isinstance(f, ExtraDataFilter) for f in logger.filters):
+            logger.addFilter(ExtraDataFilter())
 
         # 设置日志格式（在配置的格式基础上添加extra_data）
         formatter = logging.Formatter(
@@ -69,14 +142,16 @@ class Logger:
         file_handler.setFormatter(formatter)
         console_handler.setFormatter(formatter)
 
-        self.logger.addHandler(file_handler)
-        self.logger.addHandler(console_handler)
+        logger.addHandler(file_handler)
+        logger.addHandler(console_handler)
+        return logger
 
     def _log(self, level: int, message: str, extra: Optional[Dict[str, Any]] = None):
-        if extra is None:
-            extra = {}
-        extra_str = str(extra) if extra else ""
-        self.logger.log(level, message, extra={"extra_data": extra_str})
+        # 级别未开启时不构建日志记录
+        if not self.logger.isEnabledFor(level):
+            return
+        extra_data = _LazyExtra(extra) if extra else ""
+        self.logger.log(level, message, extra={"extra_data": extra_data})
 
     def debug(self, message: str, extra: Optional[Dict[str, Any]] = None):
         self._log(logging.DEBUG, message, extra)
@@ -131,7 +206,7 @@ class LoggerFactory:
         log_file: Optional[str] = None,
         level: int = logging.INFO
     ) -> logging.Logger:
-        """创建一个新的日志记录器
+        """创建一个新的日志记录器，同名记录器已配置过时直接返回
 
         Args:
             name: 日志记录器名称
@@ -141,7 +216,31 @@ class LoggerFactory:
         Returns:
             logging.Logger: 配置好的日志记录器
         """
-        logger = logging.getLogger(name)
+        with _setup_lock:
+            logger = logging.getLogger(name)
+            # 已添加过处理器，避免重复添加导致每条日志输出多次
+            if logger.handlers:
+                return logger
+            return LoggerFactory._configure(logger, log_file, level)
+
+    @staticmethod
+    def _configure(
+        logger: logging.Logger,
+        log_file: Optional[str],
+        level: int
+    ) -> logging.Logger:
+        """为日志记录器配置控制台和文件输出
+
+        记录器本身只挂一个 QueueHandler，实际的处理器在后台线程中执行。
+
+        Args:
+            logger: 日志记录器
+            log_file: 日志文件路径，如果为None则只输出到控制台
+            level: 日志级别
+
+        Returns:
+            logging.Logger: 配置好的日志记录器
+        """
         logger.setLevel(level)
 
         # 创建格式化器
@@ -150,10 +249,10 @@ class LoggerFactory:
             LoggerFactory._DATE_FORMAT
         )
 
-        # 添加控制台处理器
+        # 控制台处理器
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setFormatter(formatter)
-        logger.addHandler(console_handler)
+        handlers = [console_handler]
 
         # 如果指定了日志文件，添加文件处理器
         if log_file:
@@ -164,13 +263,16 @@ class LoggerFactory:
             # 创建轮转文件处理器
             file_handler = RotatingFileHandler(
                 log_file,
-                maxBytes=int(settings.ERROR_LOG_MAX_SIZE.replace('MB', '')) * 1024 * 1024,
-                backupCount=settings.ERROR_LOG_BACKUP_COUNT,
+                maxBytes=int(get_settings().ERROR_LOG_MAX_SIZE.replace('MB', '')) * 1024 * 1024,
+                backupCount=get_settings().ERROR_LOG_BACKUP_COUNT,
                 encoding='utf-8'
             )
             file_handler.setFormatter(formatter)
-            logger.addHandler(file_handler)
+            handlers.append(file_handler)
 
+        _dispatch_handler.targets[logger.name] = handlers
+        _ensure_listener()
+        logger.addHandler(QueueHandler(_log_queue))
         return logger
 
 
@@ -184,30 +286,30 @@ def get_logger(name: str) -> logging.Logger:
     Returns:
         logging.Logger: 配置好的日志记录器
     """
-    log_file = f"logs/{name.lower()}.log" if settings.ERROR_LOG_MAX_SIZE else None
+    log_file = f"logs/{name.lower()}.log" if get_settings().ERROR_LOG_MAX_SIZE else None
     return LoggerFactory.create_logger(name, log_file)
 
 
 # 创建默认的API日志记录器
 api_logger = LoggerFactory.create_logger(
     'api',
-    'logs/api.log' if settings.ERROR_LOG_MAX_SIZE else None
+    'logs/api.log' if get_settings().ERROR_LOG_MAX_SIZE else None
 )
 
 # 创建服务层日志记录器
 service_logger = LoggerFactory.create_logger(
     'service',
-    'logs/service.log' if settings.ERROR_LOG_MAX_SIZE else None
+    'logs/service.log' if get_settings().ERROR_LOG_MAX_SIZE else None
 )
 
 # 创建通用的应用日志记录器
 app_logger = LoggerFactory.create_logger(
     'app',
-    'logs/app.log' if settings.ERROR_LOG_MAX_SIZE else None
+    'logs/app.log' if get_settings().ERROR_LOG_MAX_SIZE else None
 )
 
 # 创建下载服务日志记录器
 download_logger = LoggerFactory.create_logger(
     'download',
-    'logs/download.log' if settings.ERROR_LOG_MAX_SIZE else None
+    'logs/download.log' if get_settings().ERROR_LOG_MAX_SIZE else None
 )
\ No newline at end of file
@@ -8,6 +8,50 @@ from app.util import get_application
 _ = get_application()
 
 class WelcomePage(QScrollArea):
+    # 字体和样式表在类加载时创建一次，各实例共用
+    _FONT_TITLE = QFont("Microsoft YaHei", 24, QFont.Weight.Bold)
+    _FONT_NUMBER = QFont("Arial", 32, QFont.Weight.Bold)
+    _FONT_STEP_TITLE = QFont("Microsoft YaHei", 16, QFont.Weight.Bold)
+    _FONT_STEP_DESC = QFont("Microsoft YaHei", 12)
+    
+    # 步骤说明
+    _STEPS = (
+        ('01', '创建素材草稿', '点击左上角新建按钮，输入标题后创建素材草稿'),
+        ('02', '导入视频和音频', '将需要使用的视频和音频素材拖拽到时间轴上'),
+        ('03', '编辑效果', '调整视频片段、添加转场、设置字幕和特效'),
+        ('04', '导出成品', '确认效果后，点击导出按钮生成最终视频'),
+    )
+    
+    # 卡片样式
+    _STYLESHEET = """
+        #guideCard {
+            background-color: white;
+            border-radius: 12px;
+            border: none;
+        }
+        
+        #guideTitle {
+            color: #333333;
+        }
+        
+        #stepNumber {
+            color: #1976D2;
+        }
+        
+        #stepTitle {
+            color: #333333;
+        }
+        
+        #stepDesc {
+            color: #666666;
+        }
+        
+        QScrollArea {
+            background: #F5F5F5;
+            border: none;
+        }
+    """
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setObjectName('welcomePage')
@@ -41,42 +85,19 @@ class WelcomePage(QScrollArea):
         title = QLabel('使用指南')
         title.setObjectName("guideTitle")
         title.setAlignment(Qt.AlignmentFlag.AlignLeft)
-        title.setFont(QFont("Microsoft YaHei", 24, QFont.Weight.Bold))
+        title.setFont(self._FONT_TITLE)
         card_layout.addWidget(title)
         
         # 添加步骤说明
-        steps = [
-            {
-                'number': '01',
-                'title': '创建素材草稿',
-                'desc': '点击左上角新建按钮，输入标题后创建素材草稿'
-            },
-            {
-                'number': '02',
-                'title': '导入视频和音频',
-                'desc': '将需要使用的视频和音频素材拖拽到时间轴上'
-            },
-            {
-                'number': '03',
-                'title': '编辑效果',
-                'desc': '调整视频片段、添加转场、设置字幕和特效'
-            },
-            {
-                'number': '04',
-                'title': '导出成品',
-                'desc': '确认效果后，点击导出按钮生成最终视频'
-            }
-        ]
-        
-        for step in steps:
+        for step_number, step_title_text, step_desc_text in self._STEPS:
             step_widget = QWidget()
             step_layout = QHBoxLayout(step_widget)
             step_layout.setSpacing(20)
             
             # 步骤序号
-            number = QLabel(step['number'])
+            number = QLabel(step_number)
             number.setObjectName("stepNumber")
-            number.setFont(QFont("Arial", 32, QFont.Weight.Bold))
+            number.setFont(self._FONT_NUMBER)
             number.setFixedWidth(80)
             step_layout.addWidget(number)
             
@@ -85,14 +106,14 @@ class WelcomePage(QScrollArea):
             content_layout = QVBoxLayout(content)
             content_layout.setSpacing(5)
             
-            step_title = QLabel(step['title'])
+            step_title = QLabel(step_title_text)
             step_title.setObjectName("stepTitle")
-            step_title.setFont(QFont("Microsoft YaHei", 16, QFont.Weight.Bold))
+            step_title.setFont(self._FONT_STEP_TITLE)
             content_layout.addWidget(step_title)
             
-            step_desc = QLabel(step['desc'])
+            step_desc = QLabel(step_desc_text)
             step_desc.setObjectName("stepDesc")
-            step_desc.setFont(QFont("Microsoft YaHei", 12))
+            step_desc.setFont(self._FONT_STEP_DESC)
             content_layout.addWidget(step_desc)
             
             step_layout.addWidget(content)
@@ -109,31 +130,4 @@ class WelcomePage(QScrollArea):
         
     def set_styles(self):
         # 设置卡片样式
-        self.setStyleSheet("""
-            #guideCard {
-                background-color: white;
-                border-radius: 12px;
-                border: none;
-            }
-            
-            #guideTitle {
-                color: #333333;
-            }
-            
-            #stepNumber {
-                color: #1976D2;
-            }
-            
-            #stepTitle {
-                color: #333333;
-            }
-            
-            #stepDesc {
-                color: #666666;
-            }
-            
-            QScrollArea {
-                background: #F5F5F5;
-                border: none;
-            }
-        """) 
\ No newline at end of file
+        self.setStyleSheet(WelcomePage._STYLESHEET)
@@ -515,13 +515,46 @@ class MainWindow(QMainWindow):
         self.welcome_page = WelcomePage()
         self.stack_widget.addWidget(self.welcome_page)
         
-        # 添加草稿箱页面
-        self.draft_box_page = DraftBoxPage()
-        self.stack_widget.addWidget(self.draft_box_page)
+        # 草稿箱和创建草稿页面在首次切换到时才创建，启动时只放置占位控件
+        self._lazy_pages = {}
+        self.add_lazy_page(DraftBoxPage, "draft_box_page")
+        self.add_lazy_page(CreateDraftPage, "create_draft_page")
+        self.stack_widget.currentChanged.connect(self._ensure_page_created)
+    
+    def add_lazy_page(self, page_class, attr_name):
+        """添加延迟创建的页面
+        
+        Args:
+            page_class: 页面类
+            attr_name: 页面创建后保存到窗口上的属性名
+            
+        Returns:
+            int: 页面在堆叠窗口中的索引
+        """
+        index = self.stack_widget.addWidget(QWidget())
+        self._lazy_pages[index] = (page_class, attr_name)
+        setattr(self, attr_name, None)
+        return index
+    
+    def _ensure_page_created(self, index):
+        """首次切换到延迟页面时创建页面并替换占位控件"""
+        entry = self._lazy_pages.pop(index, None)
+        if entry is None:
+            return
+        
+        page_class, attr_name = entry
+        page = page_class()
+        placeholder = self.stack_widget.widget(index)
+        
+        # 替换过程中会改变当前页，屏蔽信号避免重复进入
+        self.stack_widget.blockSignals(True)
+        self.stack_widget.insertWidget(index, page)
+        self.stack_widget.removeWidget(placeholder)
+        self.stack_widget.setCurrentIndex(index)
+        self.stack_widget.blockSignals(False)
         
-        # 添加创建草稿页面
-        self.create_draft_page = CreateDraftPage()
-        self.stack_widget.addWidget(self.create_draft_page)
+        placeholder.deleteLater()
+        setattr(self, attr_name, page)
     
     def add_nav_item(self, title, icon_name=None, index=None):
         """添加导航项"""
@@ -8,8 +8,16 @@ app = QApplication(sys.argv)
 from qt_material import apply_stylesheet
 apply_stylesheet(app, theme='light_blue.xml')
 
+# 安装页面样式（追加在 Material 主题之后，只解析一次）
+from app.styles import STYLE
+app.setStyleSheet(app.styleSheet() + STYLE)
+
 # 导入主窗口
 from app.window import MainWindow
+from app.services.api.base import BaseAPIService
+
+# 退出前在会话所属的事件循环中关闭共享HTTP会话
+app.aboutToQuit.connect(BaseAPIService.shutdown)
 
 def main():
     # 创建并显示主窗口
@@ -0,0 +1,34 @@
+"""将界面模块编译为C扩展
+
+用法:
+    pip install cython
+    python setup_cython.py build_ext --inplace
+
+编译后生成的 .so/.pyd 与同名 .py 并存，Python 会优先导入编译版本；
+删除编译产物即可回退到纯Python实现。
+
+app/config.py 不参与编译：pydantic 依赖运行时的类注解来构建 Settings 字段。
+"""
+from setuptools import setup
+from Cython.Build import cythonize
+
+# 需要编译的模块
+CYTHON_MODULES = [
+    "app/draft_box.py",
+    "app/create_draft.py",
+]
+
+setup(
+    name="jy-draft-ext",
+    ext_modules=cythonize(
+        CYTHON_MODULES,
+        language_level=3,
+        compiler_directives={
+            "boundscheck": False,
+            "wraparound": False,
+            "infer_types": True,
+            # 保持PyQt的信号/槽可以按Python函数绑定
+            "binding": True,
+        },
+    ),
+)